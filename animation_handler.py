@@ -1,26 +1,229 @@
 # animation_handler.py
+import logging
 import os
-from PySide6.QtCore import QObject, Signal, Slot, QTimer, QRect, QSize, Qt
-from PySide6.QtGui import QMovie, QPixmap
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QBuffer, QByteArray, QIODevice, Signal, Slot, QTimer, Qt
+from PySide6.QtGui import QImage, QImageReader, QPixmap, QPixmapCache
 from PySide6.QtWidgets import QLabel
 
+log = logging.getLogger(__name__)
+
+class FrameLRU:
+    """Bounded store of display-ready frames, keyed by frame index; the least recently shown is evicted first."""
+    def __init__(self, max_frames: int = 16):
+        self.max_frames = max_frames
+        self._frames: OrderedDict[int, QPixmap] = OrderedDict()
+
+    def get(self, idx: int, decode_fn) -> QPixmap:
+        pixmap = self._frames.get(idx)
+        if pixmap is not None:
+            self._frames.move_to_end(idx)
+            return pixmap
+        pixmap = decode_fn()
+        self._frames[idx] = pixmap
+        if len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+        return pixmap
+
+class GifFrameStream:
+    """Decodes a GIF's frames in order from its compressed bytes, for GIFs too long to keep decoded.
+
+    GIF frames are drawn over the ones before them, so the reader only moves forward; going back restarts it.
+    """
+    def __init__(self, gif_bytes: QByteArray):
+        self._bytes = gif_bytes
+        self._buffer = None # Must outlive the reader
+        self._reader = None
+        self._pos = -1      # Index in the file of the frame in self._image
+        self._image = QImage()
+
+    def image(self, src_idx: int) -> QImage:
+        if self._reader is None or src_idx < self._pos:
+            self._restart()
+        while self._pos < src_idx and self._reader.canRead():
+            image = self._reader.read()
+            if image.isNull():
+                break
+            self._image = image
+            self._pos += 1
+        return self._image
+
+    def _restart(self):
+        self._buffer = QBuffer(self._bytes)
+        self._buffer.open(QIODevice.ReadOnly)
+        self._reader = QImageReader(self._buffer, b"gif")
+        self._reader.setDecideFormatFromContent(True)
+        self._pos = -1
+
+@dataclass
+class FrameSeq:
+    """A decoded GIF ready for playback.
+
+    Short GIFs keep every frame as a pre-scaled pixmap. Longer ones keep only the compressed file
+    and decode frames as they are played, holding the most recent in a FrameLRU, so memory stays
+    bounded however many frames the GIF has.
+    """
+    delays: list[int]       # Per-frame delay in ms
+    loop_count: int         # As reported by QImageReader: -1 = forever, n = repeat n more times
+    target_size: tuple[int, int] # Display size, fixed for the whole GIF
+    frames: list[QPixmap] = field(default_factory=list) # Pre-scaled frames; empty for streamed GIFs
+    stream: GifFrameStream | None = None                # Streamed GIFs only
+    sources: list[int] = field(default_factory=list)    # Streamed GIFs: file frame index shown in each slot
+    frame_cache: FrameLRU | None = field(init=False, default=None)
+
+    def __post_init__(self):
+        if self.stream is not None:
+            self.frame_cache = FrameLRU()
+
+    @property
+    def prescaled(self) -> bool:
+        return self.stream is None
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.delays)
+
+    def pixmap(self, idx: int) -> QPixmap:
+        if self.stream is None:
+            return self.frames[idx]
+        # Scaled every time a frame falls out of the cache, so use the cheap nearest-neighbour filter
+        return self.frame_cache.get(idx, lambda: QPixmap.fromImage(
+            self.stream.image(self.sources[idx]).scaled(*self.target_size, Qt.KeepAspectRatio, Qt.FastTransformation)))
+
+class _GifDecodeSignals(QObject):
+    decoded = Signal(str, list, list, int)                          # key, pre-scaled images, delays, loop_count
+    streamed = Signal(str, QByteArray, list, list, int, int, int)   # key, GIF bytes, sources, delays, loop_count, width, height
+    failed = Signal(str, str)                                       # key, error message
+
+class GifDecodeTask(QRunnable):
+    """Decodes every frame on a pool thread to work out the playback timing. Short GIFs are
+    smooth-scaled and handed over whole; for long ones only the frame plan is kept.
+
+    Works on QImage only, since QPixmap may not be created outside the GUI thread.
+    """
+    DEFAULT_FRAME_DELAY_MS = 100 # Used when a GIF frame reports no delay
+    MIN_FRAME_INTERVAL_MS = 16   # About one display refresh at 60 Hz; shorter frames are never seen
+
+    def __init__(self, key: str, gif_filename: str, scale_factor: float, max_prescaled_frames: int,
+                 signals: _GifDecodeSignals):
+        super().__init__()
+        self.key = key
+        self.gif_filename = gif_filename
+        self.scale_factor = scale_factor
+        self.max_prescaled_frames = max_prescaled_frames
+        self.signals = signals
+
+    def run(self):
+        # Read the whole file in one go and decode from memory, so the reader never goes back to disk per frame
+        try:
+            with open(self.gif_filename, 'rb') as f:
+                gif_bytes = QByteArray(f.read())
+        except FileNotFoundError:
+            self.signals.failed.emit(self.key, f"GIF file '{self.gif_filename}' not found.")
+            return
+        except OSError as e:
+            self.signals.failed.emit(self.key, f"GIF file '{self.gif_filename}' could not be read: {e}")
+            return
+
+        buffer = QBuffer(gif_bytes) # Must outlive the reader
+        buffer.open(QIODevice.ReadOnly)
+        reader = QImageReader(buffer, b"gif")
+        reader.setDecideFormatFromContent(True)
+        if not reader.canRead():
+            self.signals.failed.emit(self.key, f"GIF file '{self.gif_filename}' is invalid. Reader error: {reader.errorString()}")
+            return
+
+        images = []     # Kept frames; dropped once the GIF turns out too long to keep decoded
+        sources = []    # Index in the file of the frame shown in each slot
+        delays = []
+        keep_images = True
+        prev = None
+        first = None
+        src_idx = -1
+        while reader.canRead():
+            image = reader.read()
+            if image.isNull():
+                break
+            src_idx += 1
+            if first is None:
+                first = image
+            delay = reader.nextImageDelay()
+            delay = delay if delay > 0 else self.DEFAULT_FRAME_DELAY_MS
+            if prev is not None and image == prev:
+                delays[-1] += delay # Identical to the previous frame: just hold that one longer
+                continue
+            prev = image
+            if delays and delays[-1] < self.MIN_FRAME_INTERVAL_MS:
+                # The previous frame would be replaced before the screen refreshes: show this one in its slot
+                sources[-1] = src_idx
+                delays[-1] += delay
+                if keep_images:
+                    images[-1] = image
+                continue
+            sources.append(src_idx)
+            delays.append(delay)
+            if keep_images:
+                images.append(image)
+                if len(images) > self.max_prescaled_frames:
+                    keep_images = False
+                    images = []
+
+        if first is None or first.width() == 0 or first.height() == 0:
+            self.signals.failed.emit(self.key, f"Cannot determine original size for {self.gif_filename}. No decodable frames.")
+            return
+
+        scaled_w = max(1, int(first.width() * self.scale_factor))
+        scaled_h = max(1, int(first.height() * self.scale_factor))
+        if not keep_images:
+            self.signals.streamed.emit(self.key, gif_bytes, sources, delays, reader.loopCount(), scaled_w, scaled_h)
+            return
+        images = [image.scaled(scaled_w, scaled_h, Qt.KeepAspectRatio, Qt.SmoothTransformation) for image in images]
+        self.signals.decoded.emit(self.key, images, delays, reader.loopCount())
+
 class AnimationHandler(QObject):
     animation_error_signal = Signal(str)
     animation_status_signal = Signal(str)
     animation_cycle_complete_signal = Signal()
 
+    # GIFs with more frames than this are decoded during playback instead of pre-scaled at load time
+    MAX_CACHED_FRAMES = 50
+    # Shared by both GIFs; a sequence is only cached if it fits in half of it, so neither evicts the other
+    PIXMAP_CACHE_LIMIT_KB = 65536
+
+    # (abs filename, scale factor) -> (QPixmapCache keys, delays, loop_count), shared by all instances
+    _frame_cache_index: dict[tuple[str, float], tuple[list[str], list[int], int]] = {}
+
     def __init__(self, display_label: QLabel, speaking_gif_filename: str, thinking_gif_filename: str, parent=None):
         super().__init__(parent)
         self.display_label = display_label
-        self.display_label.setScaledContents(False) 
+        self.display_label.setScaledContents(False)
 
         self.speaking_gif_filename_only = speaking_gif_filename
         self.thinking_gif_filename_only = thinking_gif_filename
-        
-        self.speaking_movie: QMovie | None = None 
-        self.thinking_movie: QMovie | None = None 
-        self.active_movie: QMovie | None = None
-        
+
+        self.speaking_seq: FrameSeq | None = None
+        self.thinking_seq: FrameSeq | None = None
+        self.active_seq: FrameSeq | None = None
+
+        # Playback state for the active sequence, driven by a single timer
+        self._frame_idx = 0
+        self._last_frame_idx = -1 # Index currently on the label, -1 if none
+        self._loops_remaining = 0
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._advance)
+
+        # Background decoding: display requests made before it finishes are replayed afterwards
+        self._decode_signals = _GifDecodeSignals(self)
+        self._decode_signals.decoded.connect(self._on_frames_ready)
+        self._decode_signals.streamed.connect(self._on_stream_ready)
+        self._decode_signals.failed.connect(self._on_frames_failed)
+        self._pending_decodes: set[str] = set()
+        self._deferred_display_request = None
+        self._is_stopped = False
+        self._speaking_load_started = False # The speaking GIF is only decoded once it is first needed
+
         self.speaking_gif_load_successful = False
         self.thinking_gif_load_successful = False
 
@@ -28,233 +231,267 @@ class AnimationHandler(QObject):
         self.thinking_gif_scale_factor = 0.5  # 2x smaller for hat_think.gif
         self.speaking_gif_scale_factor = 1.2  # 1.0 = no scaling for hat.gif (adjust if needed)
 
+        QPixmapCache.setCacheLimit(self.PIXMAP_CACHE_LIMIT_KB)
         self._load_movie_data()
 
-    def _load_single_movie(self, gif_filename: str) -> tuple[QMovie | None, bool]:
-        # ... (loading logic remains the same as your previous version with this file) ...
-        print(f"ANIMATION_HANDLER: Loading GIF: {gif_filename}")
-        if not os.path.exists(gif_filename):
-            err_msg = f"GIF file '{gif_filename}' not found."
-            print(f"WARNING: {err_msg}")
-            self.animation_status_signal.emit(err_msg)
-            return None, False
+    def _gif_params(self, key: str) -> tuple[str, float]:
+        if key == "speaking":
+            return self.speaking_gif_filename_only, self.speaking_gif_scale_factor
+        return self.thinking_gif_filename_only, self.thinking_gif_scale_factor
 
-        movie = QMovie(gif_filename) 
-        if not movie.isValid():
-            err_msg = f"GIF file '{gif_filename}' is invalid. QMovie error: {movie.lastErrorString()}"
-            print(f"WARNING: {err_msg}")
-            self.animation_status_signal.emit(err_msg)
-            return None, False 
-
-        movie.setCacheMode(QMovie.CacheAll)
-        print(f"INFO: GIF QMovie object created for: {gif_filename}")
-        
-        original_size_from_pixmap = QSize(0,0)
-        if movie.jumpToFrame(0):
-            pixmap = movie.currentPixmap()
-            if not pixmap.isNull():
-                original_size_from_pixmap = pixmap.size()
-        
-        original_frame_rect = movie.frameRect()
-        original_size_from_rect = original_frame_rect.size()
-        
-        if (original_size_from_rect.width() == 0 or original_size_from_rect.height() == 0) and \
-           (original_size_from_pixmap.width() == 0 or original_size_from_pixmap.height() == 0):
-            print(f"ERROR: Cannot determine original size for {gif_filename}. Both frameRect and pixmap are 0x0.")
-            return movie, False
-        elif (original_size_from_rect.width() == 0 or original_size_from_rect.height() == 0):
-            print(f"INFO: Using pixmap size for {gif_filename}: {original_size_from_pixmap.width()}x{original_size_from_pixmap.height()}")
-        return movie, True
+    def _set_seq(self, key: str, seq: FrameSeq):
+        if key == "speaking":
+            self.speaking_seq = seq
+            self.speaking_gif_load_successful = True
+        else:
+            self.thinking_seq = seq
+            self.thinking_gif_load_successful = True
+
+    def _restore_from_pixmap_cache(self, key: str) -> bool:
+        """Rebuilds a FrameSeq from QPixmapCache if an earlier instance already decoded this GIF."""
+        filename, scale_factor = self._gif_params(key)
+        entry = self._frame_cache_index.get((os.path.abspath(filename), scale_factor))
+        if not entry:
+            return False
+        cache_keys, delays, loop_count = entry
+        frames = []
+        for cache_key in cache_keys:
+            pixmap = QPixmap()
+            if not QPixmapCache.find(cache_key, pixmap) or pixmap.isNull():
+                return False # Evicted; decode again
+            frames.append(pixmap)
+        log.info("Reusing %s cached frames for %s GIF.", len(frames), key)
+        self._set_seq(key, FrameSeq(delays, loop_count, (frames[0].width(), frames[0].height()), frames=frames))
+        return True
+
+    def _store_in_pixmap_cache(self, key: str, seq: FrameSeq):
+        if not seq.prescaled:
+            return # Nothing decoded to share
+        size_kb = sum(p.width() * p.height() * p.depth() // 8 for p in seq.frames) // 1024
+        if size_kb > self.PIXMAP_CACHE_LIMIT_KB // 2:
+            log.debug("Not caching %s GIF frames: %s KB would not fit in the pixmap cache.", key, size_kb)
+            return
+        filename, scale_factor = self._gif_params(key)
+        abs_filename = os.path.abspath(filename)
+        cache_keys = []
+        for i, pixmap in enumerate(seq.frames):
+            cache_key = f"{abs_filename}:{i}:{pixmap.width()}x{pixmap.height()}"
+            QPixmapCache.insert(cache_key, pixmap)
+            cache_keys.append(cache_key)
+        self._frame_cache_index[(abs_filename, scale_factor)] = (cache_keys, seq.delays, seq.loop_count)
+
+    def _start_load(self, key: str):
+        if self._restore_from_pixmap_cache(key):
+            return
+        filename, scale_factor = self._gif_params(key)
+        log.debug("Decoding %s GIF '%s' in the background.", key, filename)
+        self._pending_decodes.add(key)
+        QThreadPool.globalInstance().start(
+            GifDecodeTask(key, filename, scale_factor, self.MAX_CACHED_FRAMES, self._decode_signals))
 
     def _load_movie_data(self):
-        # ... (loading logic remains the same) ...
-        print("ANIMATION_HANDLER: _load_movie_data called.")
-        self.speaking_movie, self.speaking_gif_load_successful = self._load_single_movie(self.speaking_gif_filename_only)
-        self.thinking_movie, self.thinking_gif_load_successful = self._load_single_movie(self.thinking_gif_filename_only)
+        log.debug("_load_movie_data called.")
+        # Only the thinking GIF is needed for the initial display
+        self._start_load("thinking")
+        if self._is_loading():
+            self.display_label.setText("Loading...")
+
+    def _ensure_speaking_loaded(self):
+        if self._speaking_load_started:
+            return
+        self._speaking_load_started = True
+        self._start_load("speaking")
+
+    def _is_loading(self) -> bool:
+        return bool(self._pending_decodes)
+
+    @Slot(str, list, list, int)
+    def _on_frames_ready(self, key: str, images: list, delays: list, loop_count: int):
+        frames = [QPixmap.fromImage(image) for image in images]
+        seq = FrameSeq(delays, loop_count, (frames[0].width(), frames[0].height()), frames=frames)
+        log.info("Decoded %s pre-scaled frames for %s GIF.", seq.frame_count, key)
+        self._set_seq(key, seq)
+        self._store_in_pixmap_cache(key, seq)
+        self._finish_decode(key)
 
-        if self.speaking_movie:
-            self.speaking_movie.updated.connect(self._on_movie_updated)
-        if self.thinking_movie:
-            self.thinking_movie.updated.connect(self._on_movie_updated)
+    @Slot(str, QByteArray, list, list, int, int, int)
+    def _on_stream_ready(self, key: str, gif_bytes: QByteArray, sources: list, delays: list, loop_count: int,
+                         width: int, height: int):
+        seq = FrameSeq(delays, loop_count, (width, height), stream=GifFrameStream(gif_bytes), sources=sources)
+        log.info("%s GIF has %s frames; decoding them during playback.", key.capitalize(), seq.frame_count)
+        self._set_seq(key, seq)
+        self._finish_decode(key)
+
+    @Slot(str, str)
+    def _on_frames_failed(self, key: str, err_msg: str):
+        log.warning(err_msg)
+        self.animation_status_signal.emit(err_msg)
+        self._finish_decode(key)
+
+    def _finish_decode(self, key: str):
+        self._pending_decodes.discard(key)
+        if self._is_stopped:
+            return
+
+        if key == "thinking" and not self.thinking_gif_load_successful:
+            self.animation_status_signal.emit(f"Warning: Thinking GIF '{self.thinking_gif_filename_only}' failed to load.")
+            self._ensure_speaking_loaded() # Needed as the fallback display
+        elif key == "speaking" and not self.speaking_gif_load_successful:
+            self.animation_status_signal.emit(f"Warning: Speaking GIF '{self.speaking_gif_filename_only}' failed to load.")
+        if self._is_loading():
+            return
 
-        # ... (error reporting remains the same) ...
         if not self.speaking_gif_load_successful and not self.thinking_gif_load_successful:
             err_msg = "Failed to load both speaking and thinking GIFs. Animations disabled."
-            print(f"ERROR: {err_msg}")
+            log.error(err_msg)
             self.animation_status_signal.emit(err_msg)
             self.animation_error_signal.emit(err_msg)
-        elif not self.speaking_gif_load_successful:
-            self.animation_status_signal.emit(f"Warning: Speaking GIF '{self.speaking_gif_filename_only}' failed to load.")
-        elif not self.thinking_gif_load_successful:
-             self.animation_status_signal.emit(f"Warning: Thinking GIF '{self.thinking_gif_filename_only}' failed to load.")
-
-
-    @Slot(QRect)
-    def _on_movie_updated(self, rect: QRect):
-        if self.active_movie and self.active_movie.isValid():
-            pixmap = self.active_movie.currentPixmap()
-            if not pixmap.isNull():
-                current_scale_factor = 1.0 # Default to no scaling
-
-                # Determine which scale factor to use
-                if self.active_movie == self.thinking_movie:
-                    current_scale_factor = self.thinking_gif_scale_factor
-                elif self.active_movie == self.speaking_movie:
-                    current_scale_factor = self.speaking_gif_scale_factor
-                
-                original_w = pixmap.width()
-                original_h = pixmap.height()
-                
-                if original_w == 0 or original_h == 0:
-                    if self.active_movie.jumpToFrame(0):
-                        base_pixmap = self.active_movie.currentPixmap()
-                        if not base_pixmap.isNull():
-                            original_w = base_pixmap.width()
-                            original_h = base_pixmap.height()
-
-                if original_w > 0 and original_h > 0:
-                    scaled_w = int(original_w * current_scale_factor)
-                    scaled_h = int(original_h * current_scale_factor)
-                    
-                    # Ensure scaled dimensions are at least 1x1 to avoid errors with QPixmap.scaled
-                    scaled_w = max(1, scaled_w)
-                    scaled_h = max(1, scaled_h)
-
-                    scaled_pixmap = pixmap.scaled(scaled_w, scaled_h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    self.display_label.setPixmap(scaled_pixmap)
-                else:
-                    self.display_label.setPixmap(pixmap) 
-            # else:
-            #    print("DEBUG: _on_movie_updated - currentPixmap isNull")
-        # else:
-        #    print("DEBUG: _on_movie_updated - No active_movie or it's invalid")
-
-    def _set_active_movie(self, movie: QMovie | None):
-        # ... (remains the same as previous version) ...
-        if self.active_movie and self.active_movie != movie and self.active_movie.state() == QMovie.Running:
-            self.active_movie.stop()
-        
-        self.active_movie = movie
-        
-        if not self.active_movie:
+
+        request, self._deferred_display_request = self._deferred_display_request, None
+        if request:
+            request()
+        elif not self.active_seq:
+            self.display_label.clear() # Drop the "Loading..." text
+            self.setup_initial_display()
+
+    def _defer_until_loaded(self, request) -> bool:
+        """Remembers the latest display request while GIFs are still decoding."""
+        if not self._is_loading():
+            return False
+        self._deferred_display_request = request
+        return True
+
+    def _show_frame(self, idx: int):
+        seq = self.active_seq
+        if not seq or idx == self._last_frame_idx:
+            return
+        self._last_frame_idx = idx
+        self.display_label.setPixmap(seq.pixmap(idx))
+
+    @Slot()
+    def _advance(self):
+        seq = self.active_seq
+        if not seq:
+            return
+        next_idx = self._frame_idx + 1
+        if next_idx >= seq.frame_count:
+            if self._loops_remaining == 0:
+                return # Played through; hold the last frame
+            if self._loops_remaining > 0:
+                self._loops_remaining -= 1
+            next_idx = 0
+        self._frame_idx = next_idx
+        self._show_frame(next_idx)
+        self._frame_timer.start(seq.delays[next_idx])
+
+    def _start_playback(self, loop_count: int):
+        self._loops_remaining = loop_count
+        if self.active_seq and self.active_seq.frame_count > 1:
+            self._frame_timer.start(self.active_seq.delays[self._frame_idx])
+
+    def _stop_playback(self):
+        self._frame_timer.stop()
+
+    def _set_active_movie(self, seq: FrameSeq | None):
+        self._stop_playback()
+        if seq is not self.active_seq:
+            self._last_frame_idx = -1
+        # Frozen and active speaking share one FrameSeq, so switching between them
+        # while frame 0 is already shown costs nothing.
+        self.active_seq = seq
+        self._frame_idx = 0
+
+        if not self.active_seq:
             self.display_label.clear()
             return
 
-        if self.active_movie.jumpToFrame(0):
-            self._on_movie_updated(self.active_movie.frameRect()) 
-        else:
-            self.display_label.clear() 
+        self._show_frame(0)
 
 
     def is_ready_to_display(self, movie_type: str = "speaking") -> bool:
-        # ... (remains the same) ...
         if movie_type == "speaking":
-            return self.speaking_gif_load_successful and self.speaking_movie is not None
+            return self.speaking_gif_load_successful and self.speaking_seq is not None
         elif movie_type == "thinking":
-            return self.thinking_gif_load_successful and self.thinking_movie is not None
+            return self.thinking_gif_load_successful and self.thinking_seq is not None
         return False
 
-    def setup_initial_display(self): 
-        # ... (remains the same) ...
-        print("ANIMATION_HANDLER: setup_initial_display (thinking GIF) called.")
+    def setup_initial_display(self):
+        log.debug("setup_initial_display (thinking GIF) called.")
+        if self._defer_until_loaded(self.setup_initial_display):
+            return
         if self.is_ready_to_display("thinking"):
-            self.set_thinking_animation(loop=True) 
-        elif self.is_ready_to_display("speaking"): 
-            print("WARNING: Thinking GIF not available, falling back to speaking GIF for initial display.")
+            self.set_thinking_animation(loop=True)
+        elif self.is_ready_to_display("speaking"):
+            log.warning("Thinking GIF not available, falling back to speaking GIF for initial display.")
             self.set_speaking_animation_frozen()
         else:
             err_msg = "Cannot setup initial display, no valid GIFs loaded."
             self._emit_error_and_complete(err_msg)
-            
-    def set_speaking_animation_active(self): 
-        # ... (remains the same, property assignment for loopCount) ...
-        if not self.is_ready_to_display("speaking") or not self.speaking_movie:
+
+    def set_speaking_animation_active(self):
+        self._ensure_speaking_loaded()
+        if self._defer_until_loaded(self.set_speaking_animation_active):
+            return
+        if not self.is_ready_to_display("speaking") or not self.speaking_seq:
             self._emit_error_and_complete(f"Speaking GIF '{self.speaking_gif_filename_only}' not ready.")
             return
 
-        print("ANIMATION_HANDLER: Setting SPEAKING animation active.")
+        log.debug("Setting SPEAKING animation active.")
         self.animation_status_signal.emit("Animation: Speaking...")
-        self._set_active_movie(self.speaking_movie) 
-        
-        self.speaking_movie.setSpeed(100)
-        try:
-            self.speaking_movie.loopCount = 1 
-        except AttributeError:
-            print(f"ERROR: speaking_movie.loopCount property assignment failed. Trying setLoopCount.")
-            self.speaking_movie.setLoopCount(1)
-
-        if self.speaking_movie.state() != QMovie.Running:
-            self.speaking_movie.start()
+        self._set_active_movie(self.speaking_seq)
+        self._start_playback(self.speaking_seq.loop_count)
 
-    def set_speaking_animation_frozen(self): 
-        # ... (remains the same) ...
-        if not self.is_ready_to_display("speaking") or not self.speaking_movie:
+    def set_speaking_animation_frozen(self):
+        self._ensure_speaking_loaded()
+        if self._defer_until_loaded(self.set_speaking_animation_frozen):
+            return
+        if not self.is_ready_to_display("speaking") or not self.speaking_seq:
             self._emit_error_and_complete(f"Speaking GIF '{self.speaking_gif_filename_only}' not ready for freeze.")
             return
-            
-        print("ANIMATION_HANDLER: Setting SPEAKING animation to frozen (frame 0).")
-        self.animation_status_signal.emit("Animation: Speaking GIF frozen.")
-        self._set_active_movie(self.speaking_movie)
 
-        if self.speaking_movie.state() == QMovie.Running:
-            self.speaking_movie.stop()
+        log.debug("Setting SPEAKING animation to frozen (frame 0).")
+        self.animation_status_signal.emit("Animation: Speaking GIF frozen.")
+        self._set_active_movie(self.speaking_seq)
         self._emit_completion()
 
     def set_thinking_animation(self, loop: bool = True):
-        # ... (remains the same, property assignment for loopCount) ...
-        if not self.is_ready_to_display("thinking") or not self.thinking_movie:
+        if self._defer_until_loaded(lambda: self.set_thinking_animation(loop)):
+            return
+        if not self.is_ready_to_display("thinking") or not self.thinking_seq:
             if self.is_ready_to_display("speaking"):
-                print("WARNING: Thinking GIF not available, falling back to frozen speaking GIF.")
-                self.set_speaking_animation_frozen() 
+                log.warning("Thinking GIF not available, falling back to frozen speaking GIF.")
+                self.set_speaking_animation_frozen()
             else:
                 self._emit_error_and_complete(f"Neither Thinking nor Speaking GIF is ready.")
             return
-            
-        print(f"ANIMATION_HANDLER: Setting THINKING animation (Loop: {loop}).")
+
+        log.debug("Setting THINKING animation (Loop: %s).", loop)
         self.animation_status_signal.emit("Animation: Thinking...")
-        self._set_active_movie(self.thinking_movie)
-        
-        self.thinking_movie.setSpeed(100)
-        loop_val = -1 if loop else 1
-        try:
-            self.thinking_movie.loopCount = loop_val
-        except AttributeError as e:
-            print(f"ERROR: thinking_movie.loopCount property assignment failed: {e}. Trying setLoopCount.")
-            self.thinking_movie.setLoopCount(loop_val) 
-
-        if loop: 
-            if self.thinking_movie.state() != QMovie.Running:
-                self.thinking_movie.start()
-        else: 
-             if self.thinking_movie.state() == QMovie.Running:
-                 self.thinking_movie.stop()
+        self._set_active_movie(self.thinking_seq)
+        if loop:
+            self._start_playback(-1)
         self._emit_completion()
 
     def tts_audio_has_finished(self):
-        # ... (remains the same) ...
-        print("ANIMATION_HANDLER: TTS audio finished. Stopping speaking GIF.")
-        if self.is_ready_to_display("speaking") and self.speaking_movie:
-            if self.speaking_movie.state() == QMovie.Running:
-                self.speaking_movie.stop()
+        log.debug("TTS audio finished. Stopping speaking GIF.")
+        if self.is_ready_to_display("speaking") and self.active_seq is self.speaking_seq:
+            self._stop_playback()
 
     def _emit_error_and_complete(self, err_msg):
-        # ... (remains the same) ...
-        print(f"ERROR: {err_msg}")
+        log.error(err_msg)
         self.animation_status_signal.emit(err_msg)
         self.animation_error_signal.emit(err_msg)
         self._emit_completion()
 
     def _emit_completion(self):
-        # ... (remains the same) ...
-        print("ANIMATION_HANDLER: Emitting animation_cycle_complete_signal.")
+        log.debug("Emitting animation_cycle_complete_signal.")
         if not self.signalsBlocked(): self.animation_cycle_complete_signal.emit()
 
     def stop_all_animation_activity(self):
-        # ... (remains the same) ...
-        print("ANIMATION_HANDLER: Stopping all animation activity.")
-        if self.speaking_movie and self.speaking_movie.state() == QMovie.Running:
-            self.speaking_movie.stop()
-        if self.thinking_movie and self.thinking_movie.state() == QMovie.Running:
-            self.thinking_movie.stop()
-        self.active_movie = None 
-        self.display_label.clear()
\ No newline at end of file
+        log.debug("Stopping all animation activity.")
+        self._is_stopped = True
+        self._deferred_display_request = None
+        self._stop_playback()
+        self.active_seq = None
+        self._last_frame_idx = -1
+        self.display_label.clear()
@@ -1,5 +1,8 @@
 # config.py
-import os
+import functools
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
 
 # --- DEEPSEEK API CONFIGURATION ---
 # The API key is imported from pwdeep.py as requested.
@@ -25,40 +28,103 @@ HAT_THINK_GIF_FILENAME = "hat_think.gif" # For thinking/idle
 
 MUSIC_FILENAME = "sortinghat_music.mp3"
 # --- Audio Configuration ---
-SAMPLE_RATE = 44100
+SAMPLE_RATE = 44100 # Fallback for input devices that cannot capture at STT_SAMPLE_RATE
+STT_SAMPLE_RATE = 16000 # Whisper-style STT resamples to 16 kHz mono anyway, so record at that and upload less
 CHANNELS = 1
 
+def _freeze(obj):
+    """Recursively turns dicts into read-only MappingProxyType views and lists into tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(x) for x in obj)
+    return obj
+
+def thaw(obj):
+    """Returns a mutable deep copy (plain dicts and lists) of a possibly frozen settings structure."""
+    if isinstance(obj, (dict, MappingProxyType)):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [thaw(x) for x in obj]
+    return obj
+
 # --- Default Application Settings (will be created/updated in settings.json) ---
-DEFAULT_SETTINGS_TEMPLATE = {
-    "academy_name": "BIBS Magical Sorting Hat",
-    "house_system_name": "Scientist",
-    "custom_houses": ["Tesla", "Darwin", "Pythagoras", "Einstein"],
-    "max_students_in_class": 8,
-    "hat_characteristics": {
-        # Simplified for Grade 6 ELL students
-        "emotions_to_display": ["kind", "curious", "a little bit funny", "smart", "caring", "a good listener"],
-        "speech_style_keywords": ["simple words", "clear sentences", "friendly", "for Grade 6 students", "easy to understand"]
-    },
-    "interaction_rules": {
-        "ask_leading_question": True,
-        "preamble_length_before_sorting": "medium",
-        "sorting_must_occur_in_this_response": True,
-        "minimum_questions_before_sorting": 1,
-        "maximum_questions_before_sorting": 1
-    },
-    "response_formatting": {
-        "target_word_count": 70,
-        "target_word_count_question": 25, # Adjusted for simpler questions
-        "target_speech_duration_seconds": 0
-    },
-    "api_parameters": {
-        "deepseek_temperature": 0.7,
-        "max_tokens_override": 0
-    },
-    "tts_settings": {
-        "available_voices": [],
-        "selected_voice_index": 6,
-        "tts_rate": 140 # Slower speed (was 200). 140-150 is a normal pace.
-    },
-    "stt_input_language_mode": 3 # 1: English, 2: Chinese (Mandarin), 3: English then Chinese
-}
\ No newline at end of file
+# Built on first use and cached. Frozen so readers can share it without copying;
+# use thaw() to get a mutable copy.
+@functools.cache
+def default_settings():
+    return _freeze({
+        "academy_name": "BIBS Magical Sorting Hat",
+        "house_system_name": "Scientist",
+        "custom_houses": ["Tesla", "Darwin", "Pythagoras", "Einstein"],
+        "max_students_in_class": 8,
+        "hat_characteristics": {
+            # Simplified for Grade 6 ELL students
+            "emotions_to_display": ["kind", "curious", "a little bit funny", "smart", "caring", "a good listener"],
+            "speech_style_keywords": ["simple words", "clear sentences", "friendly", "for Grade 6 students", "easy to understand"]
+        },
+        "interaction_rules": {
+            "ask_leading_question": True,
+            "preamble_length_before_sorting": "medium",
+            "sorting_must_occur_in_this_response": True,
+            "minimum_questions_before_sorting": 1,
+            "maximum_questions_before_sorting": 1
+        },
+        "response_formatting": {
+            "target_word_count": 70,
+            "target_word_count_question": 25, # Adjusted for simpler questions
+            "target_speech_duration_seconds": 0
+        },
+        "api_parameters": {
+            "deepseek_temperature": 0.7,
+            "max_tokens_override": 0
+        },
+        "tts_settings": {
+            "available_voices": [],
+            "no_voices_found": False, # Set when discovery ran and found nothing, so startup doesn't retry it
+            "selected_voice_index": 6,
+            "tts_rate": 140 # Slower speed (was 200). 140-150 is a normal pace.
+        },
+        "stt_input_language_mode": 3 # 1: English, 2: Chinese (Mandarin), 3: English then Chinese
+    })
+
+# --- Oracle (DeepSeek) Settings ---
+# The slice of the settings DeepSeekWorker reads, resolved once and shared
+# read-only by every worker instead of walking dotted paths per request.
+def _lookup_setting(settings, keys_str, default_val=None):
+    """Resolves a dotted key path in settings, then in the default template, then falls back to default_val."""
+    for source in (settings, default_settings()):
+        current_val = source
+        try:
+            for key in keys_str.split('.'):
+                current_val = current_val[key]
+            return current_val
+        except (KeyError, TypeError):
+            continue
+    return default_val
+
+@dataclass(frozen=True, slots=True)
+class OracleSettings:
+    academy_name: str
+    house_system_name: str
+    custom_houses: tuple | None
+    max_students_in_class: object # Validated where it is used, like the other numeric settings
+    target_word_count_question: object
+    target_word_count: object
+    deepseek_temperature: object
+    max_tokens_override: object
+
+    @classmethod
+    def from_settings(cls, settings=None):
+        settings = settings if isinstance(settings, Mapping) else default_settings()
+        custom_houses = _lookup_setting(settings, "custom_houses", ["Gryffindor", "Hufflepuff", "Ravenclaw", "Slytherin"])
+        return cls(
+            academy_name=_lookup_setting(settings, "academy_name", "The Grand Academy"),
+            house_system_name=_lookup_setting(settings, "house_system_name", "Great Houses"),
+            custom_houses=tuple(custom_houses) if isinstance(custom_houses, (list, tuple)) else None,
+            max_students_in_class=_lookup_setting(settings, "max_students_in_class", 20),
+            target_word_count_question=_lookup_setting(settings, "response_formatting.target_word_count_question", 25),
+            target_word_count=_lookup_setting(settings, "response_formatting.target_word_count", 70),
+            deepseek_temperature=_lookup_setting(settings, "api_parameters.deepseek_temperature", 0.7),
+            max_tokens_override=_lookup_setting(settings, "api_parameters.max_tokens_override", 0),
+        )
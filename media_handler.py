@@ -1,12 +1,16 @@
 # media_handler.py
+import logging
 import os
-import time # For small delays if needed, use cautiously
-import inspect # For debugging play calls
-from PySide6.QtCore import QObject, Signal, QUrl, Slot, Qt
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PySide6.QtCore import QObject, Signal, QUrl, Slot, Qt, QTimer
+from PySide6.QtMultimedia import QMediaPlayer
 from PySide6.QtMultimediaWidgets import QVideoWidget
 
+log = logging.getLogger(__name__)
+
 class MediaPlayerHandler(QObject):
+    REVERSE_SETTLE_MS = 50 # Let the backend settle after the EndOfMedia pause before reversing
+    REVERSE_POLL_MS = 30   # How often the reverse sequence checks whether it has reached the start
+
     video_error_signal = Signal(str)
     video_status_signal = Signal(str)
     video_cycle_complete_signal = Signal() # Emitted when video is frozen and UI can be reset
@@ -19,11 +23,14 @@ class MediaPlayerHandler(QObject):
 
         self.media_player = QMediaPlayer()
         self.media_player.setVideoOutput(self.video_widget)
-        self._audio_output_for_video = QAudioOutput() # Required even if muted
-        self.media_player.setAudioOutput(self._audio_output_for_video)
-        self._audio_output_for_video.setMuted(True)
+        # The video is silent: with no audio output Qt 6 decodes video only and never opens an audio stream
+        self.media_player.setAudioOutput(None)
 
         self.is_video_reversing = False
+        # Polled instead of following positionChanged, which may fire every frame
+        self._reverse_poll_timer = QTimer(self)
+        self._reverse_poll_timer.setInterval(self.REVERSE_POLL_MS)
+        self._reverse_poll_timer.timeout.connect(self._check_reverse_position)
         self.reverse_after_play_completes = False # Flag for post-TTS reverse
         self.is_initializing_first_frame = True  # Flag for initial freeze sequence
         self.video_load_successful = False
@@ -34,100 +41,119 @@ class MediaPlayerHandler(QObject):
         
         if self.video_load_successful:
             self.set_to_frozen_state() # Start initial freeze
-        else:
-            # If video load failed, _setup_video_path should have emitted video_cycle_complete_signal
-            # This is a safeguard if it's called before signals are connected somehow (though unlikely with current structure)
-            if not self.signalsBlocked():
-                 self.video_cycle_complete_signal.emit()
+        # Otherwise _setup_video_path has already emitted video_cycle_complete_signal
 
     def _debug_play(self, context_message=""):
-        caller_frame = inspect.currentframe().f_back
-        caller_function = caller_frame.f_code.co_name
-        caller_lineno = caller_frame.f_lineno
-        
-        print(f"MEDIA_PLAYER_DEBUG: play() INVOKED by {caller_function} at line {caller_lineno} [{context_message}]. "
-              f"State: {self.media_player.playbackState()}, MediaStatus: {self.media_player.mediaStatus()}, "
-              f"InitFrame: {self.is_initializing_first_frame}, ReversePending: {self.reverse_after_play_completes}, "
-              f"Reversing: {self.is_video_reversing}, ExpectTTS: {self._expect_tts_related_play}, "
-              f"Position: {self.media_player.position()}, Loops: {self.media_player.loops()}, Duration: {self.media_player.duration()}")
+        if log.isEnabledFor(logging.DEBUG):
+            # context_message already names the caller, so no frame introspection is needed
+            log.debug("play() INVOKED [%s]. State: %s, MediaStatus: %s, "
+                      "InitFrame: %s, ReversePending: %s, Reversing: %s, ExpectTTS: %s, "
+                      "Position: %s, Loops: %s, Duration: %s",
+                      context_message,
+                      self.media_player.playbackState(), self.media_player.mediaStatus(),
+                      self.is_initializing_first_frame, self.reverse_after_play_completes,
+                      self.is_video_reversing, self._expect_tts_related_play,
+                      self.media_player.position(), self.media_player.loops(), self.media_player.duration())
         self.media_player.play()
 
     def _setup_video_path(self):
-        if os.path.exists(self.video_filename_only):
+        try:
+            os.stat(self.video_filename_only) # One syscall for the existence check
+            video_found = True
+        except OSError:
+            video_found = False
+        if video_found:
             self.video_path = os.path.abspath(self.video_filename_only)
             self.media_player.setSource(QUrl.fromLocalFile(self.video_path))
             self.video_load_successful = True
             self.video_status_signal.emit(f"Video '{self.video_filename_only}' loaded.")
-            print(f"INFO: Video file found: {self.video_path}")
+            log.info("Video file found: %s", self.video_path)
         else:
             self.video_load_successful = False
             err_msg = f"Video file '{self.video_filename_only}' not found. Video playback disabled."
             self.video_status_signal.emit(err_msg) # For app status bar
             self.video_error_signal.emit(err_msg)  # For potential error dialog
-            print(f"WARNING: {err_msg}")
+            log.warning(err_msg)
             # If video load fails, UI should still become ready
-            if not self.signalsBlocked(): # Ensure signal connection exists
-                self.video_cycle_complete_signal.emit()
+            self.video_cycle_complete_signal.emit()
 
 
     def _connect_signals(self):
-        self.media_player.errorOccurred.connect(self.on_media_error)
-        self.media_player.positionChanged.connect(self.on_media_position_changed)
-        self.media_player.mediaStatusChanged.connect(self.on_media_status_changed)
-        self.media_player.playbackStateChanged.connect(self.on_playback_state_changed)
+        # The player lives on this thread, so skip AutoConnection's per-emit thread check
+        self.media_player.errorOccurred.connect(self.on_media_error, Qt.DirectConnection)
+        self.media_player.mediaStatusChanged.connect(self.on_media_status_changed, Qt.DirectConnection)
+        self.media_player.playbackStateChanged.connect(self.on_playback_state_changed, Qt.DirectConnection)
+
+    def _track_reverse_position(self, enabled: bool):
+        # Only the reverse sequence needs positions, so nothing runs per frame the rest of the time
+        if enabled:
+            self._reverse_poll_timer.start()
+        else:
+            self._reverse_poll_timer.stop()
+
+    def _ensure_single_forward_play(self):
+        # Setters reach into the backend even when nothing changes, so only touch what differs
+        if self.media_player.loops() != 1:
+            self.media_player.setLoops(1) # No looping for normal play
+        if self.media_player.playbackRate() != 1.0:
+            self.media_player.setPlaybackRate(1.0) # Ensure normal rate
 
     def is_ready(self): # If video file was loaded successfully
         return self.video_load_successful
 
     def set_to_frozen_state(self):
         if not self.video_load_successful:
-            if not self.signalsBlocked(): self.video_cycle_complete_signal.emit()
+            self.video_cycle_complete_signal.emit()
             return
 
-        print(f"VIDEO_HANDLER: Setting to FROZEN state (frame 0, paused). Loops: {self.media_player.loops()}")
+        log.debug("Setting to FROZEN state (frame 0, paused). Loops: %s", self.media_player.loops())
+        self._track_reverse_position(False)
         self.video_status_signal.emit("Video: Setting to frozen state...")
-        self.media_player.setLoops(1) # No looping for normal play
-        self.media_player.setPlaybackRate(1.0) # Ensure normal rate
+        self._ensure_single_forward_play()
         self._expect_tts_related_play = False # Not expecting TTS play during freeze sequence
 
         if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self.media_player.stop() 
         
-        self.media_player.setPosition(0)
+        if self.media_player.position() != 0:
+            self.media_player.setPosition(0)
         
         if self.media_player.playbackState() == QMediaPlayer.PlaybackState.StoppedState or \
            (self.media_player.playbackState() == QMediaPlayer.PlaybackState.PausedState and self.media_player.position() != 0):
-            print("VIDEO_HANDLER: Player stopped or paused not at 0. Initiating play()->pause() for freeze.")
+            log.debug("Player stopped or paused not at 0. Initiating play()->pause() for freeze.")
             self.is_initializing_first_frame = True 
             self._debug_play("set_to_frozen_state - for initial frame render")
         elif self.media_player.playbackState() == QMediaPlayer.PlaybackState.PausedState and self.media_player.position() == 0:
-            print("VIDEO_HANDLER: Already paused at frame 0.")
+            log.debug("Already paused at frame 0.")
             self.is_initializing_first_frame = False 
             self.is_video_reversing = False
             self.reverse_after_play_completes = False
-            if not self.signalsBlocked(): self.video_cycle_complete_signal.emit()
+            self.video_cycle_complete_signal.emit()
         else: 
-            print(f"VIDEO_HANDLER: Unexpected state for freezing: {self.media_player.playbackState()}, Pos: {self.media_player.position()}. Attempting play/pause.")
+            log.debug("Unexpected state for freezing: %s, Pos: %s. Attempting play/pause.", self.media_player.playbackState(), self.media_player.position())
             self.is_initializing_first_frame = True
             self._debug_play("set_to_frozen_state - unexpected state, attempting freeze")
 
     @Slot(QMediaPlayer.PlaybackState)
     def on_playback_state_changed(self, state: QMediaPlayer.PlaybackState):
-        print(f"VIDEO_HANDLER (StateChange): Now {state}. InitFrame: {self.is_initializing_first_frame}, "
-              f"Reversing: {self.is_video_reversing}, ReversePending: {self.reverse_after_play_completes}, ExpectTTS: {self._expect_tts_related_play}, "
-              f"Pos: {self.media_player.position()}, Dur: {self.media_player.duration()}, Loops: {self.media_player.loops()}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("(StateChange): Now %s. InitFrame: %s, Reversing: %s, ReversePending: %s, ExpectTTS: %s, "
+                      "Pos: %s, Dur: %s, Loops: %s",
+                      state, self.is_initializing_first_frame, self.is_video_reversing,
+                      self.reverse_after_play_completes, self._expect_tts_related_play,
+                      self.media_player.position(), self.media_player.duration(), self.media_player.loops())
 
         if self.is_initializing_first_frame and state == QMediaPlayer.PlaybackState.PlayingState:
             self.media_player.pause() 
-            print("VIDEO_HANDLER: Initialized and paused at first frame via on_playback_state_changed.")
+            log.debug("Initialized and paused at first frame via on_playback_state_changed.")
             self.is_initializing_first_frame = False
             self.is_video_reversing = False
             self.reverse_after_play_completes = False
             self._expect_tts_related_play = False # Ensure reset
-            if not self.signalsBlocked(): self.video_cycle_complete_signal.emit() 
+            self.video_cycle_complete_signal.emit() 
 
         elif self.is_video_reversing and state == QMediaPlayer.PlaybackState.PausedState:
-            print("VIDEO_HANDLER: Paused during reverse sequence.")
+            log.debug("Paused during reverse sequence.")
             # ... (rest of existing logic)
             self.is_video_reversing = False
             if self.reverse_after_play_completes: self.reverse_after_play_completes = False
@@ -135,12 +161,12 @@ class MediaPlayerHandler(QObject):
 
         elif state == QMediaPlayer.PlaybackState.StoppedState:
             if self.is_video_reversing: 
-                print("VIDEO_HANDLER: Stopped during reverse. Freezing.")
+                log.debug("Stopped during reverse. Freezing.")
                 self.is_video_reversing = False
                 if self.reverse_after_play_completes: self.reverse_after_play_completes = False
                 self.set_to_frozen_state()
             elif self.is_initializing_first_frame and self.media_player.mediaStatus() >= QMediaPlayer.MediaStatus.LoadedMedia:
-                print("VIDEO_HANDLER: Went to StoppedState during init. Re-attempting play() for freeze.")
+                log.debug("Went to StoppedState during init. Re-attempting play() for freeze.")
                 self._debug_play("on_playback_state_changed - Went to StoppedState during init")
             # else:
                 # print(f"VIDEO_HANDLER: StoppedState reached. Not init, not reversing. Pos: {self.media_player.position()}")
@@ -156,34 +182,35 @@ class MediaPlayerHandler(QObject):
              not self.reverse_after_play_completes and \
              not self._expect_tts_related_play and \
              state == QMediaPlayer.PlaybackState.PlayingState:
-            print(f"VIDEO_HANDLER_DEFENSE: Unexpected transition to PlayingState when not expected. Forcing pause. Pos: {self.media_player.position()}")
+            log.warning("Unexpected transition to PlayingState when not expected. Forcing pause. Pos: %s", self.media_player.position())
             self.media_player.pause()
             if self.media_player.position() < 100: # If near the start, it's likely an unwanted loop
                 # This pause should trigger PausedState again. If it then re-triggers PlayingState, there's a deeper issue.
                 # Consider if set_to_frozen_state is needed here, but be wary of loops.
                 # For now, just pausing. The problem might be that loops isn't truly 1.
-                print("VIDEO_HANDLER_DEFENSE: Paused an unexpected play near start of video.")
+                log.warning("Paused an unexpected play near start of video.")
 
 
     def play_for_tts(self):
         if not self.video_load_successful: return
-        print(f"VIDEO_HANDLER: Playing for TTS (forward once). Loops: {self.media_player.loops()}")
+        log.debug("Playing for TTS (forward once). Loops: %s", self.media_player.loops())
         self.video_status_signal.emit("Video: Playing forward...")
         self.is_initializing_first_frame = False
         self.reverse_after_play_completes = False 
         self.is_video_reversing = False
         self._expect_tts_related_play = True # This play is expected for TTS
-        self.media_player.setLoops(1)
-        self.media_player.setPlaybackRate(1.0)
-        self.media_player.setPosition(0)
+        self._track_reverse_position(False)
+        self._ensure_single_forward_play()
+        if self.media_player.position() != 0:
+            self.media_player.setPosition(0)
         self._debug_play("play_for_tts")
 
     def tts_audio_has_finished(self):
         if not self.video_load_successful:
-            if not self.signalsBlocked(): self.video_cycle_complete_signal.emit()
+            self.video_cycle_complete_signal.emit()
             return
         
-        print("VIDEO_HANDLER: TTS audio finished. Preparing for video reverse or freeze.")
+        log.debug("TTS audio finished. Preparing for video reverse or freeze.")
         self._expect_tts_related_play = False # TTS-related play is now ending/transitioning
         self.reverse_after_play_completes = True 
 
@@ -198,85 +225,94 @@ class MediaPlayerHandler(QObject):
 
         if current_status == QMediaPlayer.MediaStatus.EndOfMedia or \
            (current_state != QMediaPlayer.PlaybackState.PlayingState and duration > 0 and position >= duration - end_margin):
-            print("VIDEO_HANDLER: TTS done, video already at/near end. Triggering reverse logic.")
+            log.debug("TTS done, video already at/near end. Triggering reverse logic.")
             self.on_media_status_changed(QMediaPlayer.MediaStatus.EndOfMedia) 
         elif current_state == QMediaPlayer.PlaybackState.PlayingState:
-            print("VIDEO_HANDLER: TTS done, video still playing. Reverse will trigger on natural EndOfMedia.")
+            log.debug("TTS done, video still playing. Reverse will trigger on natural EndOfMedia.")
         else: 
-            print("VIDEO_HANDLER: TTS done, video not at end and not playing. Freezing directly.")
+            log.debug("TTS done, video not at end and not playing. Freezing directly.")
             self.reverse_after_play_completes = False 
             self.set_to_frozen_state()
 
 
-    @Slot(int) 
-    def on_media_position_changed(self, position: int):
-        # print(f"DEBUG Media Pos: {position}, Rate: {self.media_player.playbackRate()}") # Verbose
+    @Slot()
+    def _check_reverse_position(self):
+        position = self.media_player.position()
         if self.is_video_reversing and self.media_player.playbackRate() < 0:
             if position <= 50: 
-                print(f"VIDEO_HANDLER: Reached beginning (pos: {position}) while reversing. Pausing.")
+                log.debug("Reached beginning (pos: %s) while reversing. Pausing.", position)
+                self._track_reverse_position(False)
                 self.media_player.pause() 
 
     @Slot(QMediaPlayer.MediaStatus)
     def on_media_status_changed(self, status: QMediaPlayer.MediaStatus):
-        print(f"VIDEO_HANDLER (MediaStatusChange): Now {status}. InitFrame: {self.is_initializing_first_frame}, "
-              f"ReversePending: {self.reverse_after_play_completes}, Reversing: {self.is_video_reversing}, ExpectTTS: {self._expect_tts_related_play}, "
-              f"Pos: {self.media_player.position()}, Dur: {self.media_player.duration()}, Loops: {self.media_player.loops()}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("(MediaStatusChange): Now %s. InitFrame: %s, ReversePending: %s, Reversing: %s, ExpectTTS: %s, "
+                      "Pos: %s, Dur: %s, Loops: %s",
+                      status, self.is_initializing_first_frame, self.reverse_after_play_completes,
+                      self.is_video_reversing, self._expect_tts_related_play,
+                      self.media_player.position(), self.media_player.duration(), self.media_player.loops())
 
         if status == QMediaPlayer.MediaStatus.LoadedMedia and self.is_initializing_first_frame:
             if self.media_player.playbackState() == QMediaPlayer.PlaybackState.StoppedState:
-                print("VIDEO_HANDLER: Media loaded, attempting to freeze via play/pause.")
+                log.debug("Media loaded, attempting to freeze via play/pause.")
                 self.media_player.setPosition(0)
                 self._debug_play("on_media_status_changed - Media loaded, freeze via play/pause")
 
         elif status == QMediaPlayer.MediaStatus.EndOfMedia:
-            print("VIDEO_HANDLER: EndOfMedia reached.")
+            log.debug("EndOfMedia reached.")
             if self.reverse_after_play_completes and not self.is_video_reversing:
-                print("VIDEO_HANDLER: EndOfMedia after TTS forward play. Attempting reverse.")
+                log.debug("EndOfMedia after TTS forward play. Attempting reverse.")
                 self.media_player.pause() 
-                time.sleep(0.05) 
-                
-                self.media_player.setPlaybackRate(-1.0)
-                if abs(self.media_player.playbackRate() - (-1.0)) < 0.1:
-                    print("VIDEO_HANDLER: Playback rate set to -1.0. Playing in reverse.")
-                    self.is_video_reversing = True
-                    self._debug_play("on_media_status_changed - EndOfMedia after TTS, playing in reverse") 
-                else:
-                    print("VIDEO_HANDLER: Playback rate -1.0 not supported. Skipping reverse.")
-                    self.video_status_signal.emit("Video: Reverse not supported, freezing.")
-                    self.is_video_reversing = False
-                    self.reverse_after_play_completes = False
-                    self.set_to_frozen_state()
+                QTimer.singleShot(self.REVERSE_SETTLE_MS, self._start_reverse_playback)
             elif self.is_video_reversing:
-                print("VIDEO_HANDLER: EndOfMedia reached while reversing (likely hit start). Pausing.")
+                log.debug("EndOfMedia reached while reversing (likely hit start). Pausing.")
                 self.media_player.pause() 
             else: # EndOfMedia not related to TTS reverse or during reversing. Could be an unexpected play-through.
-                print("VIDEO_HANDLER: EndOfMedia reached, not in expected reverse context.")
+                log.debug("EndOfMedia reached, not in expected reverse context.")
                 # If it was playing due to an unwanted loop, it should now be stopped or paused here by the player.
                 # Ensure it's frozen if it's not already.
                 if self.media_player.playbackState() != QMediaPlayer.PlaybackState.PausedState or self.media_player.position() != 0:
-                    print("VIDEO_HANDLER: EndOfMedia, but not paused at 0. Refreezing.")
+                    log.debug("EndOfMedia, but not paused at 0. Refreezing.")
                     self.set_to_frozen_state()
 
 
         elif (status == QMediaPlayer.MediaStatus.BufferingMedia or status == QMediaPlayer.MediaStatus.BufferedMedia) and \
              self.is_initializing_first_frame and \
              self.media_player.playbackState() == QMediaPlayer.PlaybackState.StoppedState:
-            print(f"VIDEO_HANDLER: Media (un)buffered to {status} during init. Trying to play for freeze.")
+            log.debug("Media (un)buffered to %s during init. Trying to play for freeze.", status)
             self.media_player.setPosition(0)
             self._debug_play("on_media_status_changed - Media (un)buffered during init, play for freeze")
 
 
+    @Slot()
+    def _start_reverse_playback(self):
+        if not self.reverse_after_play_completes or self.is_video_reversing:
+            return # Frozen, stopped or errored while settling
+        self.media_player.setPlaybackRate(-1.0)
+        if abs(self.media_player.playbackRate() - (-1.0)) < 0.1:
+            log.debug("Playback rate set to -1.0. Playing in reverse.")
+            self.is_video_reversing = True
+            self._track_reverse_position(True)
+            self._debug_play("_start_reverse_playback - EndOfMedia after TTS, playing in reverse") 
+        else:
+            log.debug("Playback rate -1.0 not supported. Skipping reverse.")
+            self.video_status_signal.emit("Video: Reverse not supported, freezing.")
+            self.is_video_reversing = False
+            self.reverse_after_play_completes = False
+            self.set_to_frozen_state()
+
     @Slot(QMediaPlayer.Error, str)
     def on_media_error(self, error_code: QMediaPlayer.Error, error_string: str):
         if error_code != QMediaPlayer.Error.NoError and error_code != QMediaPlayer.Error.ResourceError:
             msg = f"Media Player Error: {error_string} (Code: {error_code})"
-            print(f"ERROR: {msg}")
+            log.error(msg)
             self.video_error_signal.emit(msg)
         
         self._expect_tts_related_play = False # Reset on error
         if self.is_initializing_first_frame:
             self.is_initializing_first_frame = False 
-            if not self.signalsBlocked(): self.video_cycle_complete_signal.emit() 
+            self.video_cycle_complete_signal.emit() 
         
         if self.reverse_after_play_completes or self.is_video_reversing: 
             self.reverse_after_play_completes = False
@@ -284,10 +320,11 @@ class MediaPlayerHandler(QObject):
             self.set_to_frozen_state() 
 
     def stop_all_media_activity(self):
-        print("VIDEO_HANDLER: Stopping all media player activity.")
+        log.debug("Stopping all media player activity.")
         self.is_initializing_first_frame = False
         self.is_video_reversing = False
         self.reverse_after_play_completes = False
         self._expect_tts_related_play = False
         if self.media_player:
+            self._track_reverse_position(False)
             self.media_player.stop()
\ No newline at end of file
@@ -1,6 +1,6 @@
 # media_players.py
 import os
-from PySide6.QtCore import QObject, QUrl, Slot, Signal, Qt
+from PySide6.QtCore import QObject, QUrl, Slot, Signal
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 
 class BackgroundMusicPlayer(QObject):
@@ -23,18 +23,20 @@ class BackgroundMusicPlayer(QObject):
         self.player.mediaStatusChanged.connect(self._on_media_status_changed)
         self.audio_output.mutedChanged.connect(self.mute_changed) # Forward the signal
 
-        if os.path.exists(self.music_file_path):
-            self.load_music(self.music_file_path)
-        else:
-            err_msg = f"Background music file not found: {self.music_file_path}"
-            print(f"ERROR: {err_msg}")
-            self.error_occurred.emit(err_msg)
+        self.load_music(self.music_file_path)
 
 
     def load_music(self, music_file_path: str):
+        if not music_file_path:
+            self.error_occurred.emit("Music file path is empty.")
+            return
         self.music_file_path = os.path.abspath(music_file_path)
-        if not self.music_file_path or not os.path.exists(self.music_file_path):
-            self.error_occurred.emit(f"Music file not found or path empty: {self.music_file_path}")
+        try:
+            os.stat(self.music_file_path) # One syscall for the existence check
+        except OSError:
+            err_msg = f"Background music file not found: {self.music_file_path}"
+            print(f"ERROR: {err_msg}")
+            self.error_occurred.emit(err_msg)
             return
             
         source_url = QUrl.fromLocalFile(self.music_file_path)
@@ -56,9 +58,9 @@ class BackgroundMusicPlayer(QObject):
             self.player.setLoops(QMediaPlayer.Infinite) 
             self.play()
             print(f"INFO: Background music '{os.path.basename(self.music_file_path)}' loaded and playing.")
-        elif status == QMediaPlayer.MediaStatus.EndOfMedia:
-            # Should not happen with Infinite loops, but good to have
-            print("INFO: Background music reached end, restarting due to loop.")
+        elif status == QMediaPlayer.MediaStatus.EndOfMedia and self.player.loops() != QMediaPlayer.Infinite:
+            # With Infinite loops the backend wraps around by itself; only restart if looping was turned off
+            print("INFO: Background music reached end, restarting.")
             self.player.setPosition(0)
             self.play()
         elif status == QMediaPlayer.MediaStatus.InvalidMedia:
@@ -1,120 +1,293 @@
 # settings_manager.py
+import copy
+import hashlib
 import json
+import operator
 import os
+import sys
+import tempfile
+import time
+from collections.abc import Mapping
+from importlib import metadata
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from PySide6.QtCore import QObject, Signal, Slot
 import pyttsx3 # For discovering TTS voices
-from config import SETTINGS_FILENAME, DEFAULT_SETTINGS_TEMPLATE
+from config import SETTINGS_FILENAME, default_settings, thaw
 
-class SettingsManager:
-    def __init__(self, settings_file=SETTINGS_FILENAME, defaults_template=None):
+# Both backends emit identical bytes (2-space indent, raw UTF-8, trailing newline), so switching between
+# them doesn't defeat the skip-unchanged-writes check. Key order is kept: it follows the defaults template.
+try:
+    import orjson # Optional: parses and serialises several times faster than the stdlib json
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data)
+    def _json_dumps(obj) -> bytes:
+        return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+_voice_fields = operator.attrgetter('id', 'name', 'languages', 'gender')
+
+def _discover_sapi_voices() -> list[dict]:
+    """Reads the voice tokens straight from SAPI, without starting a speech engine (Windows only)."""
+    import win32com.client
+    tokens = win32com.client.Dispatch("SAPI.SpVoice").GetVoices()
+    return [{"index": i, "id": token.Id, "name": token.GetDescription(),
+             "lang": [token.GetAttribute("Language")], "gender": token.GetAttribute("Gender")}
+            for i, token in enumerate(tokens)]
+
+def _discover_pyttsx3_voices() -> list[dict]:
+    engine = pyttsx3.init()
+    try:
+        voices = engine.getProperty('voices') or []
+    finally:
+        engine.stop()
+    return [{"index": i, "id": voice_id, "name": name, "lang": languages, "gender": gender}
+            for i, (voice_id, name, languages, gender) in enumerate(map(_voice_fields, voices))]
+
+def _discover_voices() -> list[dict]:
+    """Enumerates the installed TTS voices. This is slow, so call it off the GUI thread."""
+    if sys.platform != "win32":
+        return _discover_pyttsx3_voices()
+    import pythoncom
+    pythoncom.CoInitialize() # Runs on a worker thread; both SAPI paths below need COM set up on it
+    try:
+        try:
+            return _discover_sapi_voices()
+        except Exception as e:
+            print(f"WARNING: Direct SAPI voice enumeration failed ({e}), falling back to pyttsx3.")
+        return _discover_pyttsx3_voices()
+    finally:
+        pythoncom.CoUninitialize()
+
+def _merge_defaults(settings_data: dict, defaults: Mapping) -> bool:
+    """Adds every key missing from settings_data, descending into sub-dictionaries. Returns True if anything was added."""
+    added = False
+    stack = [(settings_data, defaults)]
+    while stack:
+        target, source = stack.pop()
+        for key, default_value in source.items():
+            if key not in target:
+                target[key] = thaw(default_value)
+                added = True
+            elif isinstance(default_value, Mapping) and isinstance(target[key], dict):
+                stack.append((target[key], default_value))
+    return added
+
+def _atomic_write(path: str, data: bytes, durable: bool = False):
+    """Writes next to path and swaps the file in, so readers never see a partial file."""
+    with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(os.path.abspath(path)), delete=False) as f:
+        try:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
+
+VOICE_CACHE_MAX_AGE_S = 7 * 24 * 3600
+_voices_memo: list[dict] | None = None # Shared by every SettingsManager in the process
+
+def _voice_cache_path() -> str:
+    """Sidecar cache of the enumerated voices, keyed by platform and pyttsx3 version."""
+    try:
+        pyttsx3_version = metadata.version("pyttsx3")
+    except metadata.PackageNotFoundError: # e.g. inside a frozen build without dist-info
+        pyttsx3_version = "unknown"
+    key = hashlib.blake2b(f"{sys.platform}|{pyttsx3_version}".encode(), digest_size=8).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"sh_voices_{key}.json")
+
+def _load_cached_voices() -> list[dict] | None:
+    global _voices_memo
+    if _voices_memo is not None:
+        return _voices_memo
+    path = _voice_cache_path()
+    try:
+        if time.time() - os.stat(path).st_mtime > VOICE_CACHE_MAX_AGE_S:
+            return None
+        with open(path, 'rb') as f:
+            voices = _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(voices, list) or not voices:
+        return None
+    _voices_memo = voices
+    return voices
+
+def _store_cached_voices(voices: list[dict]):
+    global _voices_memo
+    _voices_memo = voices
+    path = _voice_cache_path()
+    try:
+        _atomic_write(path, _json_dumps(voices))
+    except OSError as e:
+        print(f"WARNING: Could not write TTS voice cache '{path}': {e}")
+
+def _flatten(settings_data: Mapping, prefix: str = "", out: dict | None = None) -> dict:
+    """Maps every dotted key path, including the intermediate ones, to its value."""
+    if out is None:
+        out = {}
+    for key, value in settings_data.items():
+        path = f"{prefix}{key}"
+        out[path] = value
+        if isinstance(value, Mapping):
+            _flatten(value, f"{path}.", out)
+    return out
+
+class SettingsManager(QObject):
+    voices_refreshed = Signal(list)     # Emitted on the GUI thread once discovered voices are applied and saved
+    _voices_discovered = Signal(list)   # Carries the result from the discovery thread back to this object's thread
+
+    _instance = None
+
+    @classmethod
+    def instance(cls, *args, **kwargs):
+        """Process-wide shared manager, so the settings file is loaded and merged only once.
+
+        Arguments are only used by the first call, which creates it.
+        """
+        if cls._instance is None:
+            cls._instance = cls(*args, **kwargs)
+        return cls._instance
+
+    def __init__(self, settings_file=SETTINGS_FILENAME, defaults_template=None, parent=None):
+        super().__init__(parent)
         self.settings_file = settings_file
-        self.defaults_template = defaults_template if defaults_template else DEFAULT_SETTINGS_TEMPLATE.copy()
+        self.defaults_template = defaults_template if defaults_template else default_settings() # Read-only, never mutated
+        self._voice_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-voices")
+        self._voice_future = None
+        self._voice_callbacks = []
+        self._voices_discovered.connect(self._apply_discovered_voices)
+        self._saved_bytes = None # Last known content of the settings file, to skip no-op writes
         self.settings = self._load_or_create()
+        self._readonly_settings = MappingProxyType(self.settings) # Live view, always reflects self.settings
+        # Voices are cached in the settings file; only enumerate them when that cache is empty and
+        # discovery hasn't already come back empty-handed (refresh_voices_async() still retries on request)
+        tts_settings = self.settings.get("tts_settings", {})
+        if not tts_settings.get("available_voices") and not tts_settings.get("no_voices_found"):
+            cached_voices = _load_cached_voices()
+            if cached_voices:
+                print("INFO: TTS voices not found or empty in settings, restored them from the voice cache.")
+                self._apply_voices(self.settings, cached_voices)
+                self._save(self.settings)
+            else:
+                print("INFO: TTS voices not found or empty in settings, discovering them in the background.")
+                self.refresh_voices_async()
+        self._flat = _flatten(self.settings) # Serves get_setting; rebuilt whenever settings change
+
+    def refresh_voices_async(self, callback=None):
+        """Re-enumerates TTS voices on a worker thread. callback(voices) runs on the GUI thread once applied."""
+        if callback:
+            self._voice_callbacks.append(callback)
+        if self._voice_future and not self._voice_future.done():
+            return # Already running; the callback rides on that result
+        self._voice_future = self._voice_executor.submit(_discover_voices)
+        self._voice_future.add_done_callback(self._on_voice_discovery_done)
 
-    def _populate_tts_voices(self, settings_data_to_update):
-        """Populates the tts_settings.available_voices in the provided dictionary."""
+    def _on_voice_discovery_done(self, future):
+        # Runs on the executor thread; the signal is queued to the GUI thread
         try:
-            engine = pyttsx3.init()
-            voices = engine.getProperty('voices')
-            del engine
-
-            current_voices_list = []
-            if voices:
-                for i, voice in enumerate(voices):
-                    current_voices_list.append(
-                        {"index": i, "id": voice.id, "name": voice.name, 
-                         "lang": voice.languages, "gender": voice.gender}
-                    )
-            
-            # Ensure tts_settings sub-dictionary exists
-            if "tts_settings" not in settings_data_to_update:
-                settings_data_to_update["tts_settings"] = self.defaults_template["tts_settings"].copy()
-
-            settings_data_to_update["tts_settings"]["available_voices"] = current_voices_list
-            if current_voices_list:
-                # If selected_voice_index is invalid or not set, default to 0
-                if not (0 <= settings_data_to_update["tts_settings"].get("selected_voice_index", -1) < len(current_voices_list)):
-                    settings_data_to_update["tts_settings"]["selected_voice_index"] = 0
-            else:
-                settings_data_to_update["tts_settings"]["selected_voice_index"] = -1 # No voices available
-            print("INFO: TTS voices discovery complete for settings.")
-            return True # Indicates voices were (re)populated
+            voices = future.result()
         except Exception as e:
             print(f"ERROR: Could not populate TTS voices: {e}. TTS settings might be incomplete.")
-            # Ensure tts_settings structure still exists
-            if "tts_settings" not in settings_data_to_update:
-                settings_data_to_update["tts_settings"] = self.defaults_template["tts_settings"].copy()
-            if "available_voices" not in settings_data_to_update["tts_settings"]: # Should exist from copy
-                settings_data_to_update["tts_settings"]["available_voices"] = []
-            if "selected_voice_index" not in settings_data_to_update["tts_settings"]:
-                 settings_data_to_update["tts_settings"]["selected_voice_index"] = -1
+            return
+        if voices:
+            _store_cached_voices(voices)
+        self._voices_discovered.emit(voices)
+
+    @Slot(list)
+    def _apply_discovered_voices(self, voices):
+        self._apply_voices(self.settings, voices)
+        self._flat = _flatten(self.settings)
+        print("INFO: TTS voices discovery complete for settings.")
+        self._save(self.settings)
+        callbacks, self._voice_callbacks = self._voice_callbacks, []
+        for callback in callbacks:
+            callback(voices)
+        self.voices_refreshed.emit(voices)
+
+    def _apply_voices(self, settings_data_to_update, voices):
+        """Stores voices in tts_settings.available_voices and keeps selected_voice_index valid."""
+        # Ensure tts_settings sub-dictionary exists
+        if "tts_settings" not in settings_data_to_update:
+            settings_data_to_update["tts_settings"] = thaw(self.defaults_template["tts_settings"])
+
+        settings_data_to_update["tts_settings"]["available_voices"] = voices
+        settings_data_to_update["tts_settings"]["no_voices_found"] = not voices
+        if voices:
+            # If selected_voice_index is invalid or not set, default to 0
+            if not (0 <= settings_data_to_update["tts_settings"].get("selected_voice_index", -1) < len(voices)):
+                settings_data_to_update["tts_settings"]["selected_voice_index"] = 0
+        else:
+            settings_data_to_update["tts_settings"]["selected_voice_index"] = -1 # No voices available
+
+    def _save(self, settings_data) -> bool:
+        data = _json_dumps(settings_data) # Stays indented: the file is meant to be edited by hand
+        if data == self._saved_bytes:
+            return True
+        try:
+            # Durable: a corrupted file costs a reset to defaults and a fresh voice discovery on next start
+            _atomic_write(self.settings_file, data, durable=True)
+        except IOError as e_io:
+            print(f"ERROR: Could not write settings file '{self.settings_file}': {e_io}")
             return False
+        self._saved_bytes = data
+        return True
 
     def _load_or_create(self):
-        current_defaults = self.defaults_template.copy()
-        if not os.path.exists(self.settings_file):
+        # The frozen template is shared; only the fallback paths below need a mutable copy of it
+        try:
+            # Opening directly doubles as the existence check, saving a separate stat()
+            with open(self.settings_file, 'rb') as f:
+                print(f"INFO: Loading settings from '{self.settings_file}'.")
+                self._saved_bytes = f.read()
+            # A truncated or foreign file usually fails this cheap look at both ends, skipping the full parse
+            data = self._saved_bytes
+            if not (data[:64].lstrip().startswith(b"{") and data[-64:].rstrip().endswith(b"}")):
+                raise ValueError("settings file is not a JSON object")
+            loaded_settings = _json_loads(self._saved_bytes)
+
+            # Merge loaded settings with defaults to ensure all keys exist
+            if _merge_defaults(loaded_settings, self.defaults_template):
+                print(f"INFO: Settings were updated (missing keys). Saving changes to '{self.settings_file}'.")
+                self._save(loaded_settings)
+            return loaded_settings
+        except FileNotFoundError:
             print(f"INFO: '{self.settings_file}' not found. Creating default settings file.")
-            self._populate_tts_voices(current_defaults) # Populate voices in the new default set
-            try:
-                with open(self.settings_file, 'w') as f:
-                    json.dump(current_defaults, f, indent=4)
+            current_defaults = thaw(self.defaults_template)
+            if self._save(current_defaults):
                 print(f"INFO: Default settings file '{self.settings_file}' created.")
-                return current_defaults
-            except IOError as e_io:
-                print(f"ERROR: Could not write default settings file '{self.settings_file}': {e_io}")
-                return current_defaults # Return in-memory defaults
-        else:
-            print(f"INFO: Loading settings from '{self.settings_file}'.")
-            try:
-                with open(self.settings_file, 'r') as f:
-                    loaded_settings = json.load(f)
-                
-                is_updated = False
-                # If tts_settings or available_voices is missing/empty, try to repopulate
-                if not loaded_settings.get("tts_settings", {}).get("available_voices"):
-                    print("INFO: TTS voices not found or empty in loaded settings, attempting to (re)populate.")
-                    if self._populate_tts_voices(loaded_settings):
-                        is_updated = True
-                
-                # Merge loaded settings with defaults to ensure all keys exist
-                for key, default_value in self.defaults_template.items():
-                    if key not in loaded_settings:
-                        loaded_settings[key] = default_value
-                        is_updated = True
-                    elif isinstance(default_value, dict): # Merge sub-dictionaries (one level deep)
-                        for sub_key, default_sub_value in default_value.items():
-                            if sub_key not in loaded_settings.get(key, {}): # Check if sub_key exists in loaded_settings[key]
-                                if key not in loaded_settings: loaded_settings[key] = {} # Ensure parent dict exists
-                                loaded_settings[key][sub_key] = default_sub_value
-                                is_updated = True
-                
-                if is_updated:
-                    print(f"INFO: Settings were updated (missing keys/TTS voices). Saving changes to '{self.settings_file}'.")
-                    try:
-                        with open(self.settings_file, 'w') as f:
-                            json.dump(loaded_settings, f, indent=4)
-                    except IOError as e_io:
-                        print(f"ERROR: Could not save updated settings file '{self.settings_file}': {e_io}")
-                return loaded_settings
-            except Exception as e:
-                print(f"ERROR: Could not load or parse '{self.settings_file}': {e}. Using default template and attempting to save it.")
-                self._populate_tts_voices(current_defaults) # Populate new defaults
-                try:
-                    with open(self.settings_file, 'w') as f:
-                        json.dump(current_defaults, f, indent=4)
-                    print(f"INFO: Replaced corrupted/unparsable settings file with new defaults.")
-                except IOError as e_io:
-                     print(f"ERROR: Could not write new default settings file after parse error: {e_io}")
-                return current_defaults
+            return current_defaults
+        except Exception as e:
+            print(f"ERROR: Could not load or parse '{self.settings_file}': {e}. Using default template and attempting to save it.")
+            current_defaults = thaw(self.defaults_template)
+            if self._save(current_defaults):
+                print(f"INFO: Replaced corrupted/unparsable settings file with new defaults.")
+            return current_defaults
 
     def get_setting(self, key_path, default_return=None):
-        keys = key_path.split('.')
-        value = self.settings
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default_return
+        return self._flat.get(key_path, default_return)
+
+    def set_setting(self, key_path, value):
+        """Sets a dotted key path, creating missing sub-dictionaries, and saves the settings file."""
+        *parents, last_key = key_path.split('.')
+        target = self.settings
+        for key in parents:
+            target = target.setdefault(key, {})
+        target[last_key] = value
+        self._flat = _flatten(self.settings)
+        self._save(self.settings)
 
     def get_all_settings(self):
-        return self.settings.copy()
\ No newline at end of file
+        """Read-only view of the current settings; no copy is made."""
+        return self._readonly_settings
+
+    def snapshot(self):
+        """Independent, mutable deep copy of the current settings."""
+        return copy.deepcopy(self.settings)
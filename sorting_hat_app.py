@@ -1,35 +1,70 @@
 # sorting_hat_app.py
 import sys
 import os
-import time 
+import logging
 import random
+import re
+import functools
+from typing import TYPE_CHECKING
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QWidget, QTextEdit, QComboBox, QMessageBox, QSizePolicy,
-    QSpacerItem, QSlider, QToolButton 
+    QSlider, QToolButton
 )
-from PySide6.QtCore import Qt, Slot, QTimer, QSize 
-from PySide6.QtGui import QIcon 
+from PySide6.QtCore import Qt, Slot, QTimer, QSize, QEventLoop
+from PySide6.QtGui import QIcon, QTextCursor
 
-from config import HAT_GIF_FILENAME, HAT_THINK_GIF_FILENAME, DEEPSEEK_API_KEY, MUSIC_FILENAME
+from config import HAT_GIF_FILENAME, HAT_THINK_GIF_FILENAME, DEEPSEEK_API_KEY, MUSIC_FILENAME, OracleSettings
 from settings_manager import SettingsManager
-from workers import AudioRecorderWorker, SpeechToTextWorker, DeepSeekWorker, TextToSpeechWorker
 from animation_handler import AnimationHandler
 from media_players import BackgroundMusicPlayer 
 
+if TYPE_CHECKING:
+    from workers import AudioRecorderWorker, SpeechToTextWorker, DeepSeekWorker, TextToSpeechWorker
+
+@functools.cache
+def _workers():
+    """The workers module pulls in sounddevice, numpy, requests and pyttsx3; import it on first use."""
+    import workers
+    return workers
+
 
 # Define a constant for the state after sorting is done
 FINAL_SORTING_STEP_COMPLETE = 99 # Arbitrary number greater than max questions
 
+# Perceptual volume curve for the 0-100 slider, precomputed so slider drags only index a table
+VOLUME_LUT = tuple((i / 100.0) ** 2.5 for i in range(101))
+VOLUME_DEBOUNCE_MS = 20
+STATUS_COALESCE_MS = 50
+SHUTDOWN_WAIT_MS = 3500 # Shared by all workers still running when the window closes
+SHUTDOWN_EXIT_GRACE_MS = 500 # Last wait for the worker pools after the event loop has ended
+
+# End of a sentence in streamed text: terminal punctuation, optional closing quote/bracket, then whitespace
+_SENTENCE_END_RE = re.compile(r'[.!?]+["\'”’)\]]*\s+')
+
+# Dark theme; background #202123, input background #40414f, text #ececf1
+_STYLESHEET = """
+    QMainWindow { background-color: #202123; } QWidget { background-color: #202123; color: #ececf1; font-family: "Segoe UI", Arial, sans-serif; font-size: 9.5pt; } QLabel { color: #ececf1; padding: 2px; } QLabel#titleLabel { font-size: 16pt; font-weight: bold; color: #ececf1; margin-bottom: 2px; qproperty-alignment: 'AlignCenter'; } QLabel#statusLabel { color: #a9aaae; font-style: italic; margin-bottom: 5px; qproperty-alignment: 'AlignCenter'; } QLabel#animationLabel { background-color: black; border: 1px solid #40414f; qproperty-alignment: 'AlignCenter'; } QPushButton, QToolButton { background-color: #343541; color: #ececf1; border: 1px solid #565869; padding: 8px 15px; border-radius: 5px; font-weight: 500; } QToolButton { padding: 4px; } QPushButton:hover, QToolButton:hover { background-color: #4a4b57; } QPushButton:disabled, QToolButton:disabled { background-color: #2a2b32; color: #6a6b70; border: 1px solid #40414f; } QTextEdit { background-color: #40414f; border: 1px solid #565869; color: #ececf1; border-radius: 5px; padding: 6px; } QComboBox { background-color: #40414f; border: 1px solid #565869; padding: 7px 9px; border-radius: 5px; min-width: 140px; } QComboBox::drop-down { border: none; background-color: transparent; } QComboBox::down-arrow { image: url(none); } QComboBox QAbstractItemView { background-color: #40414f; border: 1px solid #565869; color: #ececf1; selection-background-color: #4a4b57; } QMessageBox { background-color: #40414f; font-size: 9pt; } QMessageBox QLabel { color: #ececf1; } QMessageBox QPushButton { background-color: #343541; min-width: 70px; padding: 6px 12px;} QSlider::groove:horizontal { border: 1px solid #565869; height: 8px; background: #40414f; margin: 2px 0; border-radius: 4px; } QSlider::handle:horizontal { background: #8e8e90; border: 1px solid #565869; width: 14px; margin: -4px 0; border-radius: 7px; } QSlider::handle:horizontal:hover { background: #a9aaae; }
+"""
+
 class SortingHatApp(QMainWindow):
+    # Keyboard shortcut -> (button that must be enabled, handler), matching the button labels
+    _KEY_DISPATCH = {
+        '1': ('record_button', 'start_recording_router'),
+        '2': ('stop_button', 'stop_audio_recording'),
+        '3': ('activate_hat_button', 'activate_oracle_interaction'),
+    }
+
     def __init__(self):
         super().__init__()
         
         self._is_shutting_down = False 
 
-        self.settings_manager = SettingsManager()
+        self.settings_manager = SettingsManager.instance()
         self.settings = self.settings_manager.get_all_settings() 
+        self.reload_settings()
+        self.settings_manager.voices_refreshed.connect(lambda _voices: self.reload_settings())
 
         academy_name = self.settings_manager.get_setting("academy_name", "AI Sorting Hat")
         self.setWindowTitle(f"The {academy_name} Sorting Hat")
@@ -39,6 +74,20 @@ class SortingHatApp(QMainWindow):
                                  "DEEPSEEK_API_KEY not found or not set. "
                                  "Please configure it and restart the application.")
 
+        # Created in _init_ui_elements / further down; set first so guards are plain truth tests
+        self.status_label = None
+        self.oracle_response_text = None
+        self.your_text_output = None
+        self.music_player = None
+        self._just_sorted_flag = False
+
+        # Status messages arriving in bursts are coalesced; only the latest per interval is painted
+        self._pending_status: str | None = None
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(STATUS_COALESCE_MS)
+        self._status_timer.timeout.connect(self._flush_status)
+
         self._init_ui_elements() 
 
         self.animation_handler = AnimationHandler(
@@ -51,10 +100,13 @@ class SortingHatApp(QMainWindow):
         self.animation_handler.animation_status_signal.connect(self._update_status_bar)
         self.animation_handler.animation_cycle_complete_signal.connect(self.on_animation_cycle_completed)
 
-        self.recorder_worker: AudioRecorderWorker | None = None
-        self.stt_worker: SpeechToTextWorker | None = None
-        self.deepseek_worker: DeepSeekWorker | None = None
-        self.tts_worker: TextToSpeechWorker | None = None
+        self.recorder_worker: "AudioRecorderWorker | None" = None
+        self.stt_worker: "SpeechToTextWorker | None" = None
+        self.deepseek_worker: "DeepSeekWorker | None" = None
+        self._streaming_speech = False # The current reply is being spoken sentence by sentence as it streams in
+        self._speech_buffer = "" # Streamed text not yet ending in a complete sentence
+        self.tts_worker: "TextToSpeechWorker | None" = None
+        self._stopping_workers = set() # Detached workers asked to stop that have not finished yet
         
         self.current_oracle_state = "idle" 
         self.interaction_step = 0 
@@ -63,11 +115,7 @@ class SortingHatApp(QMainWindow):
         print(f"INFO: SortingHatApp initialized.")
 
         initial_bg_volume_slider_value = 15
-        normalized_initial_slider_value = initial_bg_volume_slider_value / 100.0
-        power_exponent = 2.5 
-        initial_actual_volume = 0.0
-        if normalized_initial_slider_value > 0:
-            initial_actual_volume = normalized_initial_slider_value ** power_exponent
+        initial_actual_volume = VOLUME_LUT[initial_bg_volume_slider_value]
         
         self.music_player = BackgroundMusicPlayer(MUSIC_FILENAME, initial_volume=initial_actual_volume, parent=self)
         self.music_player.error_occurred.connect(self._on_music_player_error)
@@ -115,23 +163,34 @@ class SortingHatApp(QMainWindow):
         self.volume_slider = QSlider(Qt.Horizontal)
         self.volume_slider.setToolTip("Adjust Background Music Volume")
         self.volume_slider.setRange(0, 100); self.volume_slider.setFixedWidth(100) 
-        self.volume_slider.valueChanged.connect(self._change_music_volume)
+        # Coalesce drag ticks so only the latest value per ~frame reaches the audio backend
+        self._pending_volume_value = 0
+        self._volume_timer = QTimer(self)
+        self._volume_timer.setSingleShot(True)
+        self._volume_timer.setInterval(VOLUME_DEBOUNCE_MS)
+        self._volume_timer.timeout.connect(self._apply_pending_volume)
+        self.volume_slider.valueChanged.connect(self._on_volume_slider_changed)
         music_controls_layout.addWidget(self.mute_button)
         music_controls_layout.addWidget(QLabel("Vol:")) 
         music_controls_layout.addWidget(self.volume_slider)
         top_bar_layout.addLayout(music_controls_layout)
         main_layout.addLayout(top_bar_layout) 
         
-        BG_COLOR = "#202123"; INPUT_BG_COLOR = "#40414f"; TEXT_COLOR = "#ececf1"
-        self.setStyleSheet(f"""
-            QMainWindow {{ background-color: {BG_COLOR}; }} QWidget {{ background-color: {BG_COLOR}; color: {TEXT_COLOR}; font-family: "Segoe UI", Arial, sans-serif; font-size: 9.5pt; }} QLabel {{ color: {TEXT_COLOR}; padding: 2px; }} QLabel#titleLabel {{ font-size: 16pt; font-weight: bold; color: {TEXT_COLOR}; margin-bottom: 2px; qproperty-alignment: 'AlignCenter'; }} QLabel#statusLabel {{ color: #a9aaae; font-style: italic; margin-bottom: 5px; qproperty-alignment: 'AlignCenter'; }} QLabel#animationLabel {{ background-color: black; border: 1px solid #40414f; qproperty-alignment: 'AlignCenter'; }} QPushButton, QToolButton {{ background-color: #343541; color: {TEXT_COLOR}; border: 1px solid #565869; padding: 8px 15px; border-radius: 5px; font-weight: 500; }} QToolButton {{ padding: 4px; }} QPushButton:hover, QToolButton:hover {{ background-color: #4a4b57; }} QPushButton:disabled, QToolButton:disabled {{ background-color: #2a2b32; color: #6a6b70; border: 1px solid #40414f; }} QTextEdit {{ background-color: {INPUT_BG_COLOR}; border: 1px solid #565869; color: {TEXT_COLOR}; border-radius: 5px; padding: 6px; }} QComboBox {{ background-color: {INPUT_BG_COLOR}; border: 1px solid #565869; padding: 7px 9px; border-radius: 5px; min-width: 140px; }} QComboBox::drop-down {{ border: none; background-color: transparent; }} QComboBox::down-arrow {{ image: url(none); }} QComboBox QAbstractItemView {{ background-color: {INPUT_BG_COLOR}; border: 1px solid #565869; color: {TEXT_COLOR}; selection-background-color: #4a4b57; }} QMessageBox {{ background-color: {INPUT_BG_COLOR}; font-size: 9pt; }} QMessageBox QLabel {{ color: {TEXT_COLOR}; }} QMessageBox QPushButton {{ background-color: #343541; min-width: 70px; padding: 6px 12px;}} QSlider::groove:horizontal {{ border: 1px solid #565869; height: 8px; background: {INPUT_BG_COLOR}; margin: 2px 0; border-radius: 4px; }} QSlider::handle:horizontal {{ background: #8e8e90; border: 1px solid #565869; width: 14px; margin: -4px 0; border-radius: 7px; }} QSlider::handle:horizontal:hover {{ background: #a9aaae; }}
-        """)
+        self.setStyleSheet(_STYLESHEET)
         self.title_label = QLabel(self.settings_manager.get_setting("academy_name", "AI Sorting Hat")); self.title_label.setObjectName("titleLabel"); main_layout.addWidget(self.title_label)
-        self.status_label = QLabel("Status: Initializing..."); self.status_label.setObjectName("statusLabel"); main_layout.addWidget(self.status_label)
+        # Static prefix in its own label, so status updates set the message text as-is
+        status_row_layout = QHBoxLayout(); status_row_layout.setSpacing(0)
+        status_prefix_label = QLabel("Status:"); status_prefix_label.setObjectName("statusLabel")
+        self.status_label = QLabel("Initializing..."); self.status_label.setObjectName("statusLabel")
+        status_row_layout.addStretch(); status_row_layout.addWidget(status_prefix_label); status_row_layout.addWidget(self.status_label); status_row_layout.addStretch(); main_layout.addLayout(status_row_layout)
         self.animation_display_label = QLabel(); self.animation_display_label.setObjectName("animationLabel"); self.animation_display_label.setMinimumHeight(250); self.animation_display_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding); self.animation_display_label.setAlignment(Qt.AlignCenter); main_layout.addWidget(self.animation_display_label)
         config_row_layout = QHBoxLayout(); self.primary_characteristic_label = QLabel("Primary Characteristic:"); self.primary_characteristic_combo = QComboBox()
         emotions_list = self.settings_manager.get_setting("hat_characteristics.emotions_to_display", []); emotions_list = emotions_list if emotions_list and isinstance(emotions_list, list) else ["friendly", "wise", "perceptive"]
-        for emotion in emotions_list: self.primary_characteristic_combo.addItem(str(emotion).capitalize(), str(emotion))
+        emotion_values = [str(emotion) for emotion in emotions_list]
+        self.primary_characteristic_combo.blockSignals(True) # No currentIndexChanged per inserted item
+        self.primary_characteristic_combo.addItems([value.capitalize() for value in emotion_values])
+        for i, value in enumerate(emotion_values): self.primary_characteristic_combo.setItemData(i, value)
+        self.primary_characteristic_combo.blockSignals(False)
         if self.primary_characteristic_combo.count() > 0: self.primary_characteristic_combo.setCurrentIndex(0) 
         config_row_layout.addWidget(self.primary_characteristic_label); config_row_layout.addWidget(self.primary_characteristic_combo); config_row_layout.addStretch(); main_layout.addLayout(config_row_layout); main_layout.addSpacing(5)
         text_areas_layout = QHBoxLayout(); oracle_response_layout = QVBoxLayout(); self.oracle_response_label = QLabel(f"{self.settings_manager.get_setting('academy_name', 'Sorting Oracle')}:"); self.oracle_response_text = QTextEdit(); self.oracle_response_text.setReadOnly(True); oracle_response_layout.addWidget(self.oracle_response_label); oracle_response_layout.addWidget(self.oracle_response_text)
@@ -141,28 +200,45 @@ class SortingHatApp(QMainWindow):
     @Slot(str)
     def _update_status_bar(self, message: str):
         if self._is_shutting_down: return 
-        if hasattr(self, 'status_label') and self.status_label:
-            self.status_label.setText(f"Status: {message}")
+        self._pending_status = message
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+
+    @Slot()
+    def _flush_status(self):
+        message, self._pending_status = self._pending_status, None
+        if message is not None and self.status_label:
+            self.status_label.setText(message)
 
     def _stop_all_active_workers(self):
         print("DEBUG: Stopping all active workers due to interrupt/reset.")
-        self._safe_stop_worker(self.recorder_worker, "AudioRecorder (interrupt)", timeout_ms=1000)
+        self._safe_stop_worker(self.recorder_worker, "AudioRecorder (interrupt)")
         self.recorder_worker = None
-        self._safe_stop_worker(self.stt_worker, "SpeechToText (interrupt)", timeout_ms=1000)
+        self._safe_stop_worker(self.stt_worker, "SpeechToText (interrupt)")
         self.stt_worker = None
-        self._safe_stop_worker(self.deepseek_worker, "DeepSeek (interrupt)", timeout_ms=1500)
+        self._safe_stop_worker(self.deepseek_worker, "DeepSeek (interrupt)")
         self.deepseek_worker = None
-        self._safe_stop_worker(self.tts_worker, "TextToSpeech (interrupt)", timeout_ms=1500)
+        self._streaming_speech = False
+        self._speech_buffer = ""
+        self._safe_stop_worker(self.tts_worker, "TextToSpeech (interrupt)")
         self.tts_worker = None
-        QApplication.instance().processEvents()
 
-    def _reset_interaction_flow_and_ui(self, initial_message="Waiting for a lucky student..."):
-        if self._is_shutting_down: return
-        print(f"DEBUG: _reset_interaction_flow_and_ui called with message: '{initial_message}'")
-        
-        self._stop_all_active_workers() 
+    def reload_settings(self):
+        """Re-reads and validates the settings used on every interaction, so callbacks don't look them up each time."""
+        self._tts_settings = self.settings_manager.get_setting("tts_settings", {})
+        self._oracle_settings = OracleSettings.from_settings(self.settings) # One shared, read-only copy for all workers
+
+        stt_lang_mode = self.settings_manager.get_setting("stt_input_language_mode", 1) 
+        try:
+            stt_lang_mode = int(stt_lang_mode) 
+            if stt_lang_mode not in [1, 2, 3]:
+                print(f"WARNING: Invalid stt_input_language_mode '{stt_lang_mode}' in settings. Defaulting to 1 (English).")
+                stt_lang_mode = 1
+        except (ValueError, TypeError):
+            print(f"WARNING: stt_input_language_mode '{stt_lang_mode}' is not a valid integer/type. Defaulting to 1 (English).")
+            stt_lang_mode = 1
+        self._stt_lang_mode = stt_lang_mode
 
-        # --- MODIFIED SECTION: Remove hardcoded fallbacks from these calls ---
         min_questions_setting = self.settings_manager.get_setting("interaction_rules.minimum_questions_before_sorting")
         max_questions_setting = self.settings_manager.get_setting("interaction_rules.maximum_questions_before_sorting")
         
@@ -181,9 +257,15 @@ class SortingHatApp(QMainWindow):
         except (ValueError, TypeError):
             min_q, max_q = 3, 5
             print(f"WARNING: Could not parse min/max questions from settings. Using final fallback range {min_q}-{max_q}.")
-            
-        self.questions_to_ask_this_session = random.randint(min_q, max_q)
-        # --- END OF MODIFIED SECTION ---
+        self._question_range = (min_q, max_q)
+
+    def _reset_interaction_flow_and_ui(self, initial_message="Waiting for a lucky student..."):
+        if self._is_shutting_down: return
+        print(f"DEBUG: _reset_interaction_flow_and_ui called with message: '{initial_message}'")
+        
+        self._stop_all_active_workers() 
+
+        self.questions_to_ask_this_session = random.randint(*self._question_range)
 
         print(f"DEBUG: New session started. The hat will ask {self.questions_to_ask_this_session} questions before sorting.")
 
@@ -194,11 +276,11 @@ class SortingHatApp(QMainWindow):
         self.record_button.setEnabled(True)
         self.stop_button.setEnabled(False) 
 
-        if hasattr(self, 'oracle_response_text'): self.oracle_response_text.clear()
-        if hasattr(self, 'your_text_output'): self.your_text_output.clear()
+        if self.oracle_response_text: self.oracle_response_text.clear()
+        if self.your_text_output: self.your_text_output.clear()
 
         self._update_status_bar(initial_message)
-        if hasattr(self, '_just_sorted_flag'): del self._just_sorted_flag 
+        self._just_sorted_flag = False
         
         if self.animation_handler:
             print("DEBUG: _reset_interaction_flow_and_ui calling set_thinking_animation.")
@@ -206,9 +288,15 @@ class SortingHatApp(QMainWindow):
         else: 
             self.on_animation_cycle_completed() 
 
+    def _warm_up_workers(self):
+        workers = _workers()
+        if DEEPSEEK_API_KEY and DEEPSEEK_API_KEY != "YOUR_DEEPSEEK_API_KEY":
+            workers.preconnect()
+
     def complete_initial_setup(self):
         if self._is_shutting_down: return
         print("SORTING_HAT_APP: complete_initial_setup called.")
+        QTimer.singleShot(0, self._warm_up_workers) # Window is up; load the worker libraries before the first click needs them
         if self.animation_handler:
             print("DEBUG: complete_initial_setup calling setup_initial_display.")
             self.animation_handler.setup_initial_display() 
@@ -221,7 +309,7 @@ class SortingHatApp(QMainWindow):
         print(f"SORTING_HAT_APP: SLOT on_animation_cycle_completed. Oracle: {self.current_oracle_state}, App Interaction Step: {self.interaction_step}")
         
         if self.interaction_step == 0 and self.current_oracle_state == "idle":
-            if hasattr(self, '_just_sorted_flag') and self._just_sorted_flag:
+            if self._just_sorted_flag:
                 self._update_status_bar("Sorting complete. Waiting for the next student...")
             else:
                 self._update_status_bar("Waiting for a lucky student...")
@@ -256,12 +344,14 @@ class SortingHatApp(QMainWindow):
         
         selected_primary_char = self.primary_characteristic_combo.currentData() or "friendly"
 
-        self.deepseek_worker = DeepSeekWorker(user_text=None, 
+        self.deepseek_worker = _workers().DeepSeekWorker(user_text=None, 
                                               conversation_step=self.interaction_step, 
                                               questions_for_this_round=self.questions_to_ask_this_session,
                                               hat_tone=selected_primary_char, 
-                                              settings=self.settings)
+                                              settings=self._oracle_settings,
+                                              stream=True)
         self.deepseek_worker.status_signal.connect(self._update_status_bar)
+        self.deepseek_worker.partial_text_signal.connect(self._on_deepseek_partial)
         self.deepseek_worker.finished_signal.connect(self.on_deepseek_response_received)
         self.deepseek_worker.error_signal.connect(self._on_deepseek_error)
         self.deepseek_worker.start()
@@ -293,7 +383,7 @@ class SortingHatApp(QMainWindow):
         if self.recorder_worker and self.recorder_worker.isRunning(): 
              print("CRITICAL WARNING: Old recorder worker still running in _start_audio_recording_common!"); return
 
-        self.recorder_worker = AudioRecorderWorker()
+        self.recorder_worker = _workers().AudioRecorderWorker()
         self.recorder_worker.status_signal.connect(self._update_status_bar)
         self.recorder_worker.finished_signal.connect(self.on_recording_session_finished)
         self.recorder_worker.error_signal.connect(self._on_recording_error) 
@@ -323,22 +413,13 @@ class SortingHatApp(QMainWindow):
         self._prepare_for_oracle_thinking("Processing your words...")
 
         if not audio_filepath or not os.path.exists(audio_filepath) or os.path.getsize(audio_filepath) < 1024:
+            if audio_filepath: _workers().discard_recording(audio_filepath) # No STT worker will take it over
             self._handle_ui_error("No audio captured or recording was too short.") 
             return
         
         self._update_status_bar("Transcribing audio to text...")
         
-        stt_lang_mode = self.settings_manager.get_setting("stt_input_language_mode", 1) 
-        try:
-            stt_lang_mode = int(stt_lang_mode) 
-            if stt_lang_mode not in [1, 2, 3]:
-                print(f"WARNING: Invalid stt_input_language_mode '{stt_lang_mode}' in settings. Defaulting to 1 (English).")
-                stt_lang_mode = 1
-        except (ValueError, TypeError):
-            print(f"WARNING: stt_input_language_mode '{stt_lang_mode}' is not a valid integer/type. Defaulting to 1 (English).")
-            stt_lang_mode = 1
-
-        self.stt_worker = SpeechToTextWorker(audio_filepath, stt_input_language_mode=stt_lang_mode)
+        self.stt_worker = _workers().SpeechToTextWorker(audio_filepath, stt_input_language_mode=self._stt_lang_mode)
         self.stt_worker.status_signal.connect(self._update_status_bar)
         self.stt_worker.finished_signal.connect(self.on_stt_conversion_finished)
         self.stt_worker.error_signal.connect(self._on_stt_error)
@@ -365,20 +446,56 @@ class SortingHatApp(QMainWindow):
         current_deepseek_step = self.interaction_step
         
         print(f"DEBUG: Calling DeepSeekWorker with its conversation_step: {current_deepseek_step}")
-        self.deepseek_worker = DeepSeekWorker(user_text=transcribed_text, 
+        self.deepseek_worker = _workers().DeepSeekWorker(user_text=transcribed_text, 
                                               conversation_step=current_deepseek_step, 
                                               questions_for_this_round=self.questions_to_ask_this_session,
                                               hat_tone=selected_primary_char, 
-                                              settings=self.settings)
+                                              settings=self._oracle_settings,
+                                              stream=True)
         self.deepseek_worker.status_signal.connect(self._update_status_bar)
+        self.deepseek_worker.partial_text_signal.connect(self._on_deepseek_partial)
         self.deepseek_worker.finished_signal.connect(self.on_deepseek_response_received)
         self.deepseek_worker.error_signal.connect(self._on_deepseek_error)
         self.deepseek_worker.start()
 
+    @Slot(str)
+    def _on_deepseek_partial(self, text_piece):
+        if self._is_shutting_down or self.sender() is not self.deepseek_worker: return
+        if not self._streaming_speech:
+            # First piece of the reply: start speaking now rather than after the whole answer arrives
+            self._streaming_speech = True
+            self._speech_buffer = ""
+            self.oracle_response_text.clear()
+            self._advance_to_speaking()
+            self._start_tts(None)
+        self.oracle_response_text.moveCursor(QTextCursor.End)
+        self.oracle_response_text.insertPlainText(text_piece)
+
+        self._speech_buffer += text_piece
+        sentence_end = 0
+        for match in _SENTENCE_END_RE.finditer(self._speech_buffer):
+            sentence_end = match.end()
+        if sentence_end and self.tts_worker:
+            self.tts_worker.enqueue_text(self._speech_buffer[:sentence_end])
+            self._speech_buffer = self._speech_buffer[sentence_end:]
+
     def on_deepseek_response_received(self, oracle_response_text): 
         if self._is_shutting_down: return 
         print(f"DEBUG: on_deepseek_response_received. App Step: {self.interaction_step}, Total Q's this session: {self.questions_to_ask_this_session}")
         self.oracle_response_text.setPlainText(oracle_response_text)
+        if self._streaming_speech:
+            # Already speaking; hand over the unfinished last sentence and let TTS wind down
+            self._streaming_speech = False
+            if self.tts_worker:
+                if self._speech_buffer.strip():
+                    self.tts_worker.enqueue_text(self._speech_buffer)
+                self.tts_worker.end_of_text()
+            self._speech_buffer = ""
+            return
+        self._advance_to_speaking()
+        self._start_tts(oracle_response_text)
+
+    def _advance_to_speaking(self):
         self.current_oracle_state = "speaking" 
 
         if self.interaction_step < self.questions_to_ask_this_session:
@@ -392,8 +509,10 @@ class SortingHatApp(QMainWindow):
         
         if self.animation_handler: 
             self.animation_handler.set_speaking_animation_active()
-        
-        self.tts_worker = TextToSpeechWorker(oracle_response_text, self.settings_manager.get_setting("tts_settings", {}))
+
+    def _start_tts(self, oracle_response_text):
+        """Starts speaking the reply; None starts a streaming TTS worker fed by _on_deepseek_partial."""
+        self.tts_worker = _workers().TextToSpeechWorker(oracle_response_text, self._tts_settings)
         self.tts_worker.status_signal.connect(self._update_status_bar)
         self.tts_worker.finished_signal.connect(self.on_tts_playback_finished)
         self.tts_worker.error_signal.connect(self._on_tts_error)
@@ -426,17 +545,10 @@ class SortingHatApp(QMainWindow):
 
     def keyPressEvent(self, event): 
         if self._is_shutting_down: super().keyPressEvent(event); return
-        key_text = event.text() 
-        
-        if key_text == '1' and self.record_button.isEnabled(): 
-            print("DEBUG: '1' key -> Start Recording Router (Interrupts if needed)")
-            self.start_recording_router()
-        elif key_text == '2' and self.stop_button.isEnabled(): 
-            print("DEBUG: '2' key action: Stop Recording")
-            self.stop_audio_recording()
-        elif key_text == '3' and self.activate_hat_button.isEnabled():
-            print("DEBUG: '3' key action: Activate Oracle (Interrupts if needed)")
-            self.activate_oracle_interaction()
+        entry = self._KEY_DISPATCH.get(event.text())
+        if entry and getattr(self, entry[0]).isEnabled():
+            print(f"DEBUG: '{event.text()}' key action: {entry[1]}")
+            getattr(self, entry[1])()
         else: super().keyPressEvent(event)
 
     @Slot(str)
@@ -464,16 +576,19 @@ class SortingHatApp(QMainWindow):
         # --- End of FIX 2 ---
         
     @Slot(int)
+    def _on_volume_slider_changed(self, value: int):
+        self._pending_volume_value = value
+        if not self._volume_timer.isActive(): # Not restarted per tick, so a long drag still updates every interval
+            self._volume_timer.start()
+
+    @Slot()
+    def _apply_pending_volume(self):
+        self._change_music_volume(self._pending_volume_value)
+
     def _change_music_volume(self, value: int): 
         if self._is_shutting_down: return
         if self.music_player:
-            normalized_slider_value = value / 100.0  
-            power_exponent = 2.5 
-            actual_volume_to_set = 0.0
-            if normalized_slider_value > 0: 
-                actual_volume_to_set = normalized_slider_value ** power_exponent
-            actual_volume_to_set = max(0.0, min(1.0, actual_volume_to_set))
-            self.music_player.set_volume(actual_volume_to_set)
+            self.music_player.set_volume(VOLUME_LUT[max(0, min(100, value))])
 
     # --- Worker Error Slots ---
     def _on_recording_error(self, error_message): self._handle_ui_error(f"Recording Problem: {error_message}")
@@ -481,11 +596,17 @@ class SortingHatApp(QMainWindow):
     def _on_deepseek_error(self, error_message): self._handle_ui_error(f"DeepSeek API Problem: {error_message}")
     def _on_tts_error(self, error_message): self._handle_ui_error(f"Text-to-Speech Problem: {error_message}")
         
-    def _safe_stop_worker(self, worker, worker_name, timeout_ms=1500): 
+    def _safe_stop_worker(self, worker, worker_name): 
+        """Asks a running worker to stop and detaches it without blocking the GUI thread.
+
+        With its signals disconnected a late result is simply dropped; closeEvent waits
+        for everything still in self._stopping_workers.
+        """
         if worker and worker.isRunning():
             print(f"INFO: Attempting to stop worker: {worker_name}")
-            if isinstance(worker, AudioRecorderWorker): worker.stop_recording()
-            elif isinstance(worker, TextToSpeechWorker): worker.stop_tts_signal()
+            worker.cancel() # Frees its pool thread instead of finishing an API call nobody is waiting for
+            if isinstance(worker, _workers().AudioRecorderWorker): worker.stop_recording()
+            elif isinstance(worker, _workers().TextToSpeechWorker): worker.stop_tts_signal()
             
             try: worker.finished_signal.disconnect()
             except (TypeError, RuntimeError): pass 
@@ -494,19 +615,39 @@ class SortingHatApp(QMainWindow):
             try: worker.status_signal.disconnect()
             except (TypeError, RuntimeError): pass
 
-            worker.quit() 
-            if not worker.wait(timeout_ms): 
-                print(f"WARNING: Worker {worker_name} did not finish in {timeout_ms}ms. Terminating.")
-                worker.terminate()
-                if not worker.wait(500): print(f"ERROR: Worker {worker_name} did not terminate after explicit call.")
-            else: print(f"INFO: Worker {worker_name} finished gracefully.")
+            self._stopping_workers.add(worker)
+            worker.finished.connect(self._on_worker_torn_down) # Bound slot, so it is queued onto the GUI thread
+            if not worker.isRunning(): self._stopping_workers.discard(worker) # Finished before the connect
         elif worker: print(f"INFO: Worker {worker_name} already finished or not running (checked by _safe_stop_worker).")
 
+    @Slot()
+    def _on_worker_torn_down(self):
+        worker = self.sender()
+        self._stopping_workers.discard(worker)
+        print(f"INFO: Worker {type(worker).__name__} finished after stop request.")
+
+    @staticmethod
+    def _wait_for_workers(workers, timeout_ms):
+        """Waits for all workers in parallel, up to one shared timeout, without handling user input meanwhile."""
+        pending = [w for w in workers if w.isRunning()]
+        if not pending: return True
+        loop = QEventLoop()
+        def quit_when_all_done():
+            if not any(w.isRunning() for w in pending): loop.quit()
+        for w in pending: w.finished.connect(quit_when_all_done)
+        QTimer.singleShot(timeout_ms, loop.quit)
+        if any(w.isRunning() for w in pending): # Checked after connecting so a finish in between still ends the loop
+            loop.exec(QEventLoop.ExcludeUserInputEvents)
+        for w in pending:
+            try: w.finished.disconnect(quit_when_all_done)
+            except (TypeError, RuntimeError): pass
+        return not any(w.isRunning() for w in pending)
+
     def closeEvent(self, event):
         if self._is_shutting_down: super().closeEvent(event); return
         print("INFO: Initiating application shutdown...")
         self._is_shutting_down = True; self._update_status_bar("Shutting down application...")
-        if hasattr(self, 'music_player') and self.music_player: print("INFO: Stopping background music player."); self.music_player.stop()
+        if self.music_player: print("INFO: Stopping background music player."); self.music_player.stop()
         
         if self.animation_handler:
             self.animation_handler.stop_all_animation_activity()
@@ -519,14 +660,19 @@ class SortingHatApp(QMainWindow):
                 try: sig.disconnect(slot_func)
                 except (TypeError, RuntimeError): pass
         
-        self._safe_stop_worker(self.tts_worker, "TextToSpeech", timeout_ms=3500); self.tts_worker = None 
-        self._safe_stop_worker(self.recorder_worker, "AudioRecorder", timeout_ms=3500); self.recorder_worker = None
-        self._safe_stop_worker(self.stt_worker, "SpeechToText", timeout_ms=3500); self.stt_worker = None
-        self._safe_stop_worker(self.deepseek_worker, "DeepSeek", timeout_ms=3500); self.deepseek_worker = None
+        self._safe_stop_worker(self.tts_worker, "TextToSpeech"); self.tts_worker = None 
+        self._safe_stop_worker(self.recorder_worker, "AudioRecorder"); self.recorder_worker = None
+        self._safe_stop_worker(self.stt_worker, "SpeechToText"); self.stt_worker = None
+        self._safe_stop_worker(self.deepseek_worker, "DeepSeek"); self.deepseek_worker = None
+        # One shared deadline for everything still stopping, so shutdown costs the slowest worker, not the sum
+        if not self._wait_for_workers(list(self._stopping_workers), SHUTDOWN_WAIT_MS):
+            print(f"WARNING: {sum(w.isRunning() for w in self._stopping_workers)} worker(s) still running after {SHUTDOWN_WAIT_MS}ms.")
         
-        print("INFO: All active workers processed for shutdown."); QApplication.instance().processEvents(); super().closeEvent(event)
+        print("INFO: All active workers processed for shutdown."); super().closeEvent(event)
 
 if __name__ == "__main__":
+    # Modules log through the logging package; debug output stays off unless enabled here
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(name)s: %(message)s")
     try:
         script_dir = os.path.dirname(os.path.abspath(__file__))
         if os.getcwd() != script_dir:
@@ -538,4 +684,10 @@ if __name__ == "__main__":
     main_window = SortingHatApp()
     main_window.showMaximized()
     QTimer.singleShot(250, main_window.complete_initial_setup)
-    sys.exit(app.exec())
\ No newline at end of file
+    exit_code = app.exec()
+    if "workers" in sys.modules and not sys.modules["workers"].shutdown_worker_pools(SHUTDOWN_EXIT_GRACE_MS):
+        # A worker is still inside a network call; the pools' destructors would hold the process until it times out
+        print("WARNING: Exiting with workers still running.")
+        logging.shutdown(); sys.stdout.flush(); sys.stderr.flush()
+        os._exit(exit_code)
+    sys.exit(exit_code)
\ No newline at end of file
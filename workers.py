@@ -1,32 +1,214 @@
 # workers.py
-import sys
+import concurrent.futures
+import contextlib
+import functools
+import io
+import json
+import logging
 import os
+import queue
+import re
+import tempfile
+import threading
 import time
+import uuid
 import wave
-import json
-import re
+from collections.abc import Mapping
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
 
 # External library imports
-import sounddevice as sd
-from scipy.io.wavfile import write as write_wav
 import numpy as np
+import sounddevice as sd
 import requests  # Used for DeepSeek API calls
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pyttsx3
 
 # Local configuration imports
 from config import (
-    AUDIO_FILENAME, SAMPLE_RATE, CHANNELS, DEFAULT_SETTINGS_TEMPLATE,
+    AUDIO_FILENAME, SAMPLE_RATE, STT_SAMPLE_RATE, CHANNELS, default_settings, OracleSettings,
     DEEPSEEK_API_KEY, DEEPSEEK_API_URL, DEEPSEEK_STT_API_URL # Import all required API info
 )
 
+log = logging.getLogger(__name__)
+
+try:
+    import orjson # Optional: parses and serialises several times faster than the stdlib json
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# One session for all API calls, so STT and chat requests reuse the same kept-alive HTTPS connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4, pool_maxsize=4,
+    # Only retry failures to connect: the request never reached the server, so it can't be billed twice.
+    # Errors once it was sent (including 5xx replies) surface to the worker's handlers as before.
+    max_retries=Retry(total=2, connect=2, read=0, status=0, redirect=0, backoff_factor=0.3),
+))
+
+API_CONNECT_TIMEOUT_S = 5 # Short, so a detached worker that cannot reach the server frees its pool thread quickly
+API_READ_TIMEOUT_S = 60
+
+def _warm_connections():
+    for url in (DEEPSEEK_API_URL, DEEPSEEK_STT_API_URL):
+        try:
+            _SESSION.head(url, timeout=5)
+        except requests.exceptions.RequestException as e:
+            log.debug("Preconnect to %s failed: %s", url, e)
+
+def preconnect():
+    """Opens the API's HTTPS connection in the background, so the first STT or chat call
+    finds a pooled socket instead of paying for the TCP and TLS handshakes."""
+    threading.Thread(target=_warm_connections, name="api-preconnect", daemon=True).start()
+
+# -----------------------------------------------------------------------------
+# PooledWorker
+# Base for all workers below. run() executes on a long-lived QThreadPool thread
+# instead of a freshly created QThread, while keeping the small part of the
+# QThread API the app relies on (start, isRunning, wait, finished).
+# -----------------------------------------------------------------------------
+# Pool name -> max threads. TTS gets a single thread so the shared speech engine is only
+# ever driven from one OS thread (SAPI's COM objects are tied to the thread that created them).
+WORKER_POOL_MAX_THREADS = {
+    "default": 6, # Recorder, STT, DeepSeek, with headroom (stopped workers may still be finishing)
+    "tts": 1,
+}
+
+_worker_pools = {}
+
+def _get_worker_pool(name):
+    pool = _worker_pools.get(name)
+    if pool is None:
+        pool = _worker_pools[name] = QThreadPool()
+        pool.setMaxThreadCount(WORKER_POOL_MAX_THREADS[name])
+        pool.setExpiryTimeout(-1) # Keep idle threads for reuse rather than letting them exit
+    return pool
+
+def shutdown_worker_pools(timeout_ms):
+    """Drops queued workers, closes the API session and waits up to timeout_ms for the
+    running ones. Returns False if any are still running: the pools have no parent and
+    wait for them in their destructors, so the caller should exit without running those."""
+    _SESSION.close()
+    for pool in _worker_pools.values():
+        pool.clear()
+    deadline = time.monotonic() + timeout_ms / 1000.0
+    all_done = True
+    for pool in _worker_pools.values():
+        remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+        all_done = pool.waitForDone(remaining_ms) and all_done
+    return all_done
+
+class WorkerCancelled(Exception):
+    """Raised inside run() when the app has detached the worker with cancel()."""
+
+class _WorkerRunnable(QRunnable):
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker # Keeps the worker alive until run() returns, even if the app dropped it
+
+    def run(self):
+        try:
+            if not self.worker._cancelled:
+                self.worker.run()
+            else: # Cancelled while still queued: don't start at all
+                self.worker._cancelled_before_run()
+        finally:
+            self.worker._done.set()
+            self.worker.finished.emit()
+
+class PooledWorker(QObject):
+    finished = Signal() # Emitted from the pool thread once run() has returned
+    POOL = "default" # Key into WORKER_POOL_MAX_THREADS
+
+    def __init__(self):
+        super().__init__()
+        self._done = threading.Event()
+        self._done.set()
+        self._cancelled = False
+        self._responses = set() # API responses currently being read, closed by cancel()
+        self._responses_lock = threading.Lock()
+
+    def start(self):
+        if not self._done.is_set():
+            return
+        self._done.clear()
+        _get_worker_pool(self.POOL).start(_WorkerRunnable(self))
+
+    def isRunning(self):
+        return not self._done.is_set()
+
+    def wait(self, timeout_ms=None):
+        """Blocks until run() has returned; returns False if timeout_ms elapsed first."""
+        return self._done.wait(None if timeout_ms is None else timeout_ms / 1000.0)
+
+    def cancel(self):
+        """Tells a detached worker its result is no longer wanted. No new API request is sent,
+        and responses being read are closed, so the pool thread is freed for the next worker."""
+        self._cancelled = True
+        self._close_responses()
+
+    def _close_responses(self):
+        with self._responses_lock:
+            responses = list(self._responses)
+        for response in responses:
+            try:
+                response.close()
+            except Exception as e:
+                log.debug("%s: Closing response on cancel failed: %s", type(self).__name__, e)
+
+    @contextlib.contextmanager
+    def _api_post(self, url, **kwargs):
+        """_SESSION.post that cancel() can interrupt. The response is streamed, so it exists
+        (and can be closed) as soon as the headers arrive; reading .content still works."""
+        if self._cancelled:
+            raise WorkerCancelled()
+        response = _SESSION.post(url, timeout=(API_CONNECT_TIMEOUT_S, API_READ_TIMEOUT_S), stream=True, **kwargs)
+        with self._responses_lock:
+            self._responses.add(response)
+        try:
+            if self._cancelled:
+                raise WorkerCancelled()
+            yield response
+        finally:
+            with self._responses_lock:
+                self._responses.discard(response)
+            response.close() # Hands a fully read connection back to the pool
+
+    def _cancelled_before_run(self):
+        """Called instead of run() when cancel() came first; releases anything run() would have."""
+
+    def run(self):
+        raise NotImplementedError
+
+
+def _new_recording_path():
+    """A fresh WAV file per recording, so a new one never waits for an old upload to let go of its file."""
+    stem, ext = os.path.splitext(AUDIO_FILENAME)
+    fd, path = tempfile.mkstemp(prefix=f"{stem}_", suffix=ext)
+    os.close(fd)
+    return path
+
+def discard_recording(path):
+    """Deletes a recording made by AudioRecorderWorker once nothing needs it any more."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        log.warning("Could not delete recording '%s': %s", path, e)
+
+
 # -----------------------------------------------------------------------------
 # AudioRecorderWorker (No changes needed)
 # This worker handles audio recording using the system's microphone.
 # It does not make any network calls and works offline.
 # -----------------------------------------------------------------------------
-class AudioRecorderWorker(QThread):
+class AudioRecorderWorker(PooledWorker):
     finished_signal = Signal(str)
     error_signal = Signal(str)
     status_signal = Signal(str)
@@ -34,172 +216,404 @@ class AudioRecorderWorker(QThread):
     def __init__(self):
         super().__init__()
         self.recording = False
-        self.frames = []
-        print("DEBUG AudioRecorderWorker: Initialized.")
+        self._chunks = queue.SimpleQueue() # Raw int16 blocks from _callback, then None from stop_recording()
+        self._samplerate = STT_SAMPLE_RATE
+        self.audio_filepath = None # Created by run(); handed to the app, whose STT worker deletes it
+        log.debug("AudioRecorderWorker: Initialized.")
 
     def run(self):
         self.recording = True
-        self.frames = []
+        self._chunks = queue.SimpleQueue()
+        self._status_count = 0
+        self._last_status = None
         self.status_signal.emit("Recording... Speak into your microphone.")
-        print("DEBUG AudioRecorderWorker: run() started, self.recording=True")
+        log.debug("AudioRecorderWorker: run() started, self.recording=True")
         try:
             try:
-                sd.check_input_settings(samplerate=SAMPLE_RATE, channels=CHANNELS)
-                print("DEBUG AudioRecorderWorker: Audio device check successful.")
+                self._samplerate = self._pick_samplerate()
+                log.debug("AudioRecorderWorker: Audio device check successful (%s Hz).", self._samplerate)
             except Exception as device_check_error:
                 err_msg = f"Audio device check failed: {device_check_error}."
-                print(f"ERROR AudioRecorderWorker: {err_msg}")
+                log.error("AudioRecorderWorker: %s", err_msg)
                 self.error_signal.emit(err_msg)
                 self.status_signal.emit("Error: Audio device issue.")
                 return
 
-            with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, callback=self._callback,
-                                 blocksize=int(SAMPLE_RATE * 0.1), dtype='float32'):
-                print("DEBUG AudioRecorderWorker: InputStream started.")
-                while self.recording:
-                    self.msleep(50)
-
-            print("DEBUG AudioRecorderWorker: self.recording is False, exited recording loop.")
+            # The WAV file is written while recording, so stopping only has to flush the last blocks
+            bytes_written = 0
+            self.audio_filepath = _new_recording_path()
+            with wave.open(self.audio_filepath, 'wb') as wf:
+                wf.setnchannels(CHANNELS)
+                wf.setsampwidth(2) # int16
+                wf.setframerate(self._samplerate)
+                with self._open_stream():
+                    log.debug("AudioRecorderWorker: InputStream started.")
+                    while True:
+                        chunk = self._chunks.get() # Sleeps until a block arrives or stop_recording() posts None
+                        if chunk is None:
+                            break
+                        wf.writeframesraw(chunk)
+                        bytes_written += len(chunk)
+                # Stream is closed, so no more blocks can arrive; write what is still queued
+                while not self._chunks.empty():
+                    chunk = self._chunks.get_nowait()
+                    wf.writeframesraw(chunk)
+                    bytes_written += len(chunk)
+            if self._status_count:
+                log.debug("AudioRecorderWorker: %s audio callback status report(s), last: %s", self._status_count, self._last_status)
+
+            log.debug("AudioRecorderWorker: self.recording is False, exited recording loop.")
+
+            if self._cancelled:
+                log.debug("AudioRecorderWorker: Cancelled; dropping the recording.")
+                discard_recording(self.audio_filepath)
+                return
 
-            if not self.frames:
+            if not bytes_written:
+                discard_recording(self.audio_filepath)
                 self.status_signal.emit("No audio recorded.")
                 self.finished_signal.emit("")
-                print("DEBUG AudioRecorderWorker: No frames recorded.")
+                log.debug("AudioRecorderWorker: No frames recorded.")
                 return
 
-            self.status_signal.emit("Processing recorded audio...")
-            audio_data_float = np.concatenate(self.frames, axis=0)
-
-            if np.issubdtype(audio_data_float.dtype, np.integer):
-                max_val = np.iinfo(audio_data_float.dtype).max
-                audio_data_float = audio_data_float.astype(np.float32) / max_val
-            elif audio_data_float.dtype == np.float64:
-                 audio_data_float = audio_data_float.astype(np.float32)
-
-            audio_data_float = np.clip(audio_data_float, -1.0, 1.0)
-            audio_data_int16 = (audio_data_float * 32767).astype(np.int16)
-
-            write_wav(AUDIO_FILENAME, SAMPLE_RATE, audio_data_int16)
-            self.finished_signal.emit(AUDIO_FILENAME)
-            print(f"DEBUG AudioRecorderWorker: Finished, emitted audio file: {AUDIO_FILENAME}")
+            self.finished_signal.emit(self.audio_filepath)
+            log.debug("AudioRecorderWorker: Finished, emitted audio file: %s", self.audio_filepath)
 
         except sd.PortAudioError as pae:
+            if self.audio_filepath: discard_recording(self.audio_filepath)
             detailed_error = f"PortAudio error: {pae}."
-            print(f"ERROR AudioRecorderWorker: {detailed_error}")
+            log.error("AudioRecorderWorker: %s", detailed_error)
             self.error_signal.emit(detailed_error)
             self.status_signal.emit(f"Error: {detailed_error.split('.')[0]}")
         except Exception as e:
-            print(f"ERROR AudioRecorderWorker: Unexpected error: {e}")
+            if self.audio_filepath: discard_recording(self.audio_filepath)
+            log.error("AudioRecorderWorker: Unexpected error: %s", e)
             self.error_signal.emit(f"Audio recording error: {e}")
             self.status_signal.emit(f"Error during recording: {e}")
         finally:
-            print("DEBUG AudioRecorderWorker: run() method finished.")
+            log.debug("AudioRecorderWorker: run() method finished.")
+
+    def _pick_samplerate(self):
+        """STT_SAMPLE_RATE if the input device accepts it, otherwise SAMPLE_RATE."""
+        try:
+            sd.check_input_settings(samplerate=STT_SAMPLE_RATE, channels=CHANNELS, dtype='int16')
+            return STT_SAMPLE_RATE
+        except Exception as e:
+            log.info("AudioRecorderWorker: %s Hz input unavailable (%s); recording at %s Hz.", STT_SAMPLE_RATE, e, SAMPLE_RATE)
+        sd.check_input_settings(samplerate=SAMPLE_RATE, channels=CHANNELS, dtype='int16')
+        return SAMPLE_RATE
+
+    def _open_stream(self):
+        """Low-latency input stream, falling back to the device's high-latency setting where low is unsupported."""
+        stream_args = dict(samplerate=self._samplerate, channels=CHANNELS, dtype='int16',
+                           blocksize=2048, callback=self._callback) # Power of two avoids re-chunking in PortAudio; ~8 wakeups/s at 16 kHz
+        try:
+            stream = sd.RawInputStream(latency='low', **stream_args)
+        except sd.PortAudioError as e:
+            log.info("AudioRecorderWorker: Low-latency input unavailable (%s); using high latency.", e)
+            stream = sd.RawInputStream(latency='high', **stream_args)
+        return stream
 
     def _callback(self, indata, frames, time_info, status):
         if status:
-            print(f"DEBUG Audio callback status: {status}")
+            # No logging on the audio thread; run() reports these once the stream is closed
+            self._status_count += 1
+            self._last_status = status
         if self.recording:
-            self.frames.append(indata.copy())
+            self._chunks.put(bytes(indata)) # PortAudio reuses its buffer, so take a copy
 
     def stop_recording(self):
-        print("DEBUG AudioRecorderWorker: stop_recording() called.")
+        log.debug("AudioRecorderWorker: stop_recording() called.")
         if self.recording:
             self.recording = False
+            self._chunks.put(None) # Wakes run() straight away; blocks already queued ahead of it are still written
             self.status_signal.emit("Stopping recording...")
-            print("DEBUG AudioRecorderWorker: self.recording flag set to False.")
+            log.debug("AudioRecorderWorker: self.recording flag set to False.")
         else:
-            print("DEBUG AudioRecorderWorker: stop_recording() called but already not recording.")
-
+            log.debug("AudioRecorderWorker: stop_recording() called but already not recording.")
+
+
+class _MultipartUpload:
+    """multipart/form-data body that streams a file from disk rather than building the
+    whole request in memory, as requests' files= does.
+
+    Provides what requests/urllib3 need from a streamed body: read(), len() for the
+    Content-Length header, and tell()/seek() so a retried POST can rewind.
+    """
+
+    def __init__(self, fields, file_field, filename, fileobj, file_content_type):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        head = "".join(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+                       for name, value in fields.items())
+        head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+                 f'Content-Type: {file_content_type}\r\n\r\n')
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        head = head.encode("utf-8")
+        self._segments = [(io.BytesIO(head), len(head)),
+                          (fileobj, os.fstat(fileobj.fileno()).st_size),
+                          (io.BytesIO(tail), len(tail))]
+        self._length = sum(length for _, length in self._segments)
+        self._pos = 0
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self): # requests only streams bodies that are iterable
+        return iter(lambda: self.read(64 * 1024), b"")
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        self._pos = pos if whence == io.SEEK_SET else (self._pos + pos if whence == io.SEEK_CUR else self._length + pos)
+        return self._pos
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._length - self._pos
+        chunks, offset = [], 0
+        for stream, length in self._segments:
+            if size <= 0:
+                break
+            if self._pos < offset + length:
+                stream.seek(self._pos - offset)
+                chunk = stream.read(min(size, offset + length - self._pos))
+                chunks.append(chunk)
+                self._pos += len(chunk)
+                size -= len(chunk)
+            offset += length
+        return b"".join(chunks)
 
 # -----------------------------------------------------------------------------
 # SpeechToTextWorker (MODIFIED)
 # This worker now sends audio to the DeepSeek STT API instead of Google.
 # It no longer uses the `speech_recognition` library.
 # -----------------------------------------------------------------------------
-class SpeechToTextWorker(QThread):
+STT_SILENCE_RMS = 0.005 # Recordings quieter than this (RMS, full scale = 1.0) are not sent for transcription
+STT_MIN_DURATION_S = 0.3 # Recordings shorter than this are too short to hold an answer
+
+def _wav_level(path):
+    """Duration in seconds and root-mean-square level (scaled to 0..1) of a 16-bit PCM WAV file."""
+    with wave.open(path, 'rb') as wf:
+        n_frames = wf.getnframes()
+        duration_s = n_frames / wf.getframerate()
+        if duration_s < STT_MIN_DURATION_S:
+            return duration_s, None # The header alone decides; no need to read the samples
+        samples = np.frombuffer(wf.readframes(n_frames), dtype=np.int16)
+    if not samples.size:
+        return duration_s, 0.0
+    return duration_s, float(np.sqrt(np.mean(np.square(samples, dtype=np.float32)))) / 32768.0
+
+class SpeechToTextWorker(PooledWorker):
     finished_signal = Signal(str)
     error_signal = Signal(str)
     status_signal = Signal(str)
 
     def __init__(self, audio_filepath, stt_input_language_mode=1):
         super().__init__()
-        self.audio_filepath = audio_filepath
+        self.audio_filepath = audio_filepath # Deleted once this worker is done with it
         self.stt_input_language_mode = stt_input_language_mode
-        print(f"DEBUG SpeechToTextWorker: Initialized with STT Mode: {self.stt_input_language_mode}")
+        self._uploads = [] # Per-language upload futures that may still be reading the file
+        log.debug("SpeechToTextWorker: Initialized with STT Mode: %s", self.stt_input_language_mode)
 
     def _transcribe_with_deepseek(self, language_code):
         """Helper method to call the DeepSeek STT API."""
         self.status_signal.emit(f"Transcribing ({language_code.upper()})...")
-        print(f"DEBUG STT: Calling DeepSeek STT API with lang='{language_code}'")
+        log.debug("STT: Calling DeepSeek STT API with lang='%s'", language_code)
 
-        headers = {"Authorization": f"Bearer {DEEPSEEK_API_KEY}"}
-        
         with open(self.audio_filepath, 'rb') as f:
-            files = {'file': (os.path.basename(self.audio_filepath), f, 'audio/wav')}
             data = {
                 'model': 'deepseek-whisper',
                 'language': language_code
             }
-            response = requests.post(DEEPSEEK_STT_API_URL, headers=headers, files=files, data=data, timeout=60)
-
-        response.raise_for_status()  # Raises HTTPError for bad responses (4xx or 5xx)
-        response_data = response.json()
+            body = _MultipartUpload(data, 'file', os.path.basename(self.audio_filepath), f, 'audio/wav')
+            headers = {"Authorization": f"Bearer {DEEPSEEK_API_KEY}", "Content-Type": body.content_type}
+            with self._api_post(DEEPSEEK_STT_API_URL, headers=headers, data=body) as response:
+                response.raise_for_status()  # Raises HTTPError for bad responses (4xx or 5xx)
+                response_data = _json_loads(response.content)
 
         transcribed_text = response_data.get('text', '').strip()
         if not transcribed_text:
             raise ValueError(f"API returned empty transcription for lang='{language_code}'.")
         
-        print(f"DEBUG STT: Success with lang='{language_code}'. Text: {transcribed_text}")
+        log.debug("STT: Success with lang='%s'. Text: %s", language_code, transcribed_text)
         return transcribed_text
 
+    def _transcribe_by_preference(self, langs):
+        """Runs one transcription per language at once, but takes them in the order given: a later
+        language is only used if every earlier one failed. Whisper returns text for English audio
+        even under a 'zh' hint, so the fastest reply is not necessarily the right one.
+        Raises the last error if they all fail."""
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(langs), thread_name_prefix="stt")
+        self._uploads = [executor.submit(self._transcribe_with_deepseek, lang_code) for lang_code in langs]
+        last_error = None
+        try:
+            for lang_code, future in zip(langs, self._uploads):
+                try:
+                    text = future.result()
+                except Exception as e:
+                    log.info("STT Worker: Attempt with lang='%s' failed: %s", lang_code, e)
+                    last_error = e
+                    continue
+                self._close_responses() # Drop a less preferred reply that is already being read
+                return text
+        finally:
+            # Don't wait for the less preferred requests; their results are discarded when they land
+            executor.shutdown(wait=False, cancel_futures=True)
+        raise last_error
+
+    def _discard_audio_file(self):
+        pending = [f for f in self._uploads if not f.done()]
+        if pending:
+            # A slower language's upload is still sending the file; delete it once that one is done
+            pending[0].add_done_callback(lambda _f: self._discard_audio_file())
+            return
+        discard_recording(self.audio_filepath)
+
+    def _cancelled_before_run(self):
+        self._discard_audio_file()
+
     def run(self):
+        try:
+            self._transcribe()
+        finally:
+            self._discard_audio_file()
+
+    def _transcribe(self):
         self.status_signal.emit("Preparing to transcribe audio...")
-        print(f"DEBUG STT Worker: Starting run(). Processing file: '{self.audio_filepath}', STT Mode: {self.stt_input_language_mode}")
+        log.debug("STT Worker: Starting run(). Processing file: '%s', STT Mode: %s", self.audio_filepath, self.stt_input_language_mode)
 
         if not os.path.exists(self.audio_filepath) or os.path.getsize(self.audio_filepath) < 1024:
             err_msg = f"Audio file for STT not found or is empty: {self.audio_filepath}"
-            print(f"ERROR STT Worker: {err_msg}")
+            log.error("STT Worker: %s", err_msg)
             self.error_signal.emit(err_msg)
             self.status_signal.emit("STT Error: Audio file missing or empty.")
             return
 
+        try:
+            duration_s, rms = _wav_level(self.audio_filepath)
+        except (OSError, EOFError, wave.Error, ZeroDivisionError) as e:
+            log.info("STT Worker: Could not inspect audio (%s); transcribing anyway.", e)
+            duration_s, rms = None, None
+        if duration_s is not None and (duration_s < STT_MIN_DURATION_S or rms < STT_SILENCE_RMS):
+            # Reported like a failed transcription, so the student is asked to try again, but without the upload
+            log.debug("STT Worker: Recording too short or silent (%.2fs, RMS %s); skipping transcription.", duration_s, rms)
+            self.error_signal.emit("No speech detected in the recording. Please try again.")
+            self.status_signal.emit("No speech detected.")
+            return
+
         try:
             lang_map = {
                 1: ["en"],          # English only
                 2: ["zh"],          # Chinese only
-                3: ["en", "zh"]     # Try English, then Chinese
+                3: ["en", "zh"]     # Both at once; Chinese only if English fails
             }
             langs_to_try = lang_map.get(self.stt_input_language_mode, ["en"])
 
-            last_error = None
-            for lang_code in langs_to_try:
-                try:
-                    text = self._transcribe_with_deepseek(lang_code)
-                    self.status_signal.emit("Transcription successful.")
-                    self.finished_signal.emit(text)
-                    return  # Success, exit the worker
-                except Exception as e:
-                    print(f"INFO STT Worker: Attempt with lang='{lang_code}' failed: {e}")
-                    last_error = e
-
-            # If the loop finishes, all attempts failed.
-            if last_error:
-                raise last_error # Re-raise the last error to be caught below
+            if len(langs_to_try) == 1:
+                text = self._transcribe_with_deepseek(langs_to_try[0])
             else:
-                raise Exception("No languages were attempted for STT (internal error).")
+                text = self._transcribe_by_preference(langs_to_try)
+            self.status_signal.emit("Transcription successful.")
+            self.finished_signal.emit(text)
 
+        except WorkerCancelled:
+            log.debug("STT Worker: Cancelled.")
         except requests.exceptions.RequestException as e:
             err_msg = f"STT Network Error: {e}"
-            print(f"ERROR STT Worker: {err_msg}")
+            log.error("STT Worker: %s", err_msg)
             self.error_signal.emit(err_msg)
             self.status_signal.emit("STT network connection error.")
         except Exception as e:
             err_msg = f"STT failed after all attempts: {e}"
-            print(f"ERROR STT Worker: {err_msg}")
+            log.error("STT Worker: %s", err_msg)
             self.error_signal.emit(err_msg)
             self.status_signal.emit("Could not understand audio.")
         finally:
-            print("DEBUG STT Worker: run() method finished.")
+            log.debug("STT Worker: run() method finished.")
+
+
+# The house list and class size only change with the settings, so their prompt
+# fragments are built once per distinct value rather than on every prompt.
+@functools.cache
+def _houses_string(custom_houses_list):
+    if isinstance(custom_houses_list, (list, tuple)) and len(custom_houses_list) > 0:
+        if len(custom_houses_list) > 1:
+            return f"{', '.join(custom_houses_list[:-1])}, or {custom_houses_list[-1]}"
+        return custom_houses_list[0]
+    log.warning("custom_houses in settings is not a valid list or is empty.")
+    return "a default house (if none are configured)"
+
+@functools.cache
+def _group_balance_info(max_students: int, num_houses: int):
+    base_size = max_students // num_houses
+    remainder = max_students % num_houses
+    group_sizes = {}
+    for i in range(num_houses):
+        size = base_size + 1 if i < remainder else base_size
+        if size in group_sizes:
+            group_sizes[size] += 1
+        else:
+            group_sizes[size] = 1
+    size_descriptions = []
+    for size, count in sorted(group_sizes.items(), reverse=True):
+        group_str = "group" if count == 1 else "groups"
+        student_str = "student" if size == 1 else "students"
+        size_descriptions.append(f"{count} {group_str} with {size} {student_str}")
+    return (f"The maximum class size is {max_students}. To keep the houses balanced, "
+            f"they should be organized as evenly as possible: {', and '.join(size_descriptions)}. "
+            "Keep this principle of balance in mind when you are sorting.")
+
+@functools.lru_cache(maxsize=32)
+def _build_system_prompt(settings, hat_tone, conversation_step, questions_for_this_round):
+    """The system prompt depends only on these arguments, so a session rebuilds it once per step."""
+    academy_name = settings.academy_name
+    house_system_name = settings.house_system_name
+    custom_houses_list = settings.custom_houses
+    houses_string = _houses_string(custom_houses_list)
+
+    prompt_parts = [
+        f"You are an AI Sorting Hat for the {academy_name}. You are very old and very smart.",
+        "Your job is to talk to a Grade 6 student who is learning English. Use VERY simple words and short sentences. Be friendly and easy to understand.",
+        "Speak DIRECTLY to the student as the Sorting Hat. Do NOT say things like 'Here is my response:'. Just start talking.",
+        f"For this talk, your main personality is: {hat_tone}."
+    ]
+
+    if conversation_step < questions_for_this_round:
+        question_number = conversation_step + 1
+        if conversation_step == 0:
+            prompt_parts.append(f"This is your first time talking. Ask the student your Question {question_number} to learn about them. For example: 'Hello! What is your name?' or 'Tell me, what do you like to do for fun?'. Keep your question short and simple. Do NOT sort the student yet.")
+        else:
+            prompt_parts.append(f"The student answered your last question. Now, ask your Question {question_number}. It should be a new, simple question to learn more about them. For example: 'What makes you feel brave?' or 'What is your favorite subject in school?'. Do NOT sort the student yet.")
+
+    elif conversation_step == questions_for_this_round:
+        num_houses = len(custom_houses_list) if custom_houses_list and isinstance(custom_houses_list, (list, tuple)) and len(custom_houses_list) > 0 else 4
+        max_students = settings.max_students_in_class
+        group_balance_info = ""
+        if num_houses > 0:
+            try:
+                group_balance_info = _group_balance_info(int(max_students), num_houses)
+            except (ValueError, TypeError):
+                group_balance_info = "Your goal is to keep the houses balanced."
+                log.warning("max_students_in_class ('%s') is not a valid number. Using default balance prompt.", max_students)
+
+        prompt_parts.append(f"You have asked all your questions. This is your final answer. Based on what the student said, you MUST choose one of these {house_system_name} for them: {houses_string}. {group_balance_info} Tell them the house and give a short, simple reason why you chose it. You MUST sort them now.")
+
+    else:
+         prompt_parts.append(f"Something is wrong. Just sort the student into one of the {house_system_name}: {houses_string}. Give a simple reason.")
+
+    word_target_q = settings.target_word_count_question
+    word_target_sort = settings.target_word_count
+
+    is_question_turn = (conversation_step < questions_for_this_round)
+    if is_question_turn:
+         prompt_parts.append(f"Your question should be about {word_target_q} words long.")
+    else:
+         prompt_parts.append(f"Your full answer should be about {word_target_sort} words long.")
+
+    prompt_parts.append(f"Only use the house names I gave you: {houses_string}. Do not use stars (*) or long dashes (—) in your answer.")
+    return " ".join(prompt_parts)
 
 
 # -----------------------------------------------------------------------------
@@ -207,107 +621,29 @@ class SpeechToTextWorker(QThread):
 # This worker handles the chat completions API call to DeepSeek.
 # Its existing implementation is correct and works in China.
 # -----------------------------------------------------------------------------
-class DeepSeekWorker(QThread):
+class DeepSeekWorker(PooledWorker):
     finished_signal = Signal(str)
     error_signal = Signal(str)
     status_signal = Signal(str)
+    partial_text_signal = Signal(str) # Each streamed piece of the reply, only when stream=True
 
-    def __init__(self, user_text, conversation_step, questions_for_this_round, hat_tone="friendly", settings=None):
+    def __init__(self, user_text, conversation_step, questions_for_this_round, hat_tone="friendly", settings=None,
+                 stream=False):
         super().__init__()
+        self.stream = stream
         self.user_text = user_text
         self.conversation_step = conversation_step
         self.questions_for_this_round = questions_for_this_round
         self.hat_tone = hat_tone
-        self.settings = settings if isinstance(settings, dict) else DEFAULT_SETTINGS_TEMPLATE.copy()
-        print(f"DEBUG DeepSeekWorker: Initialized. Step: {conversation_step}, Total Q's: {self.questions_for_this_round}, Tone: {hat_tone}")
-
-    def get_setting(self, keys_str, default_val=None):
-        current_val = self.settings
-        try:
-            for key in keys_str.split('.'):
-                current_val = current_val[key]
-            return current_val
-        except (KeyError, TypeError):
-            current_val_default_template = DEFAULT_SETTINGS_TEMPLATE
-            try:
-                for key in keys_str.split('.'):
-                    current_val_default_template = current_val_default_template[key]
-                return current_val_default_template
-            except (KeyError, TypeError):
-                return default_val
+        # Prefer a shared OracleSettings; a settings mapping is still accepted and resolved here
+        self.settings = settings if isinstance(settings, OracleSettings) else OracleSettings.from_settings(settings)
+        log.debug("DeepSeekWorker: Initialized. Step: %s, Total Q's: %s, Tone: %s", conversation_step, self.questions_for_this_round, hat_tone)
 
     def get_system_prompt(self):
-        academy_name = self.get_setting("academy_name", "The Grand Academy")
-        house_system_name = self.get_setting("house_system_name", "Great Houses")
-        custom_houses_list = self.get_setting("custom_houses", ["Gryffindor", "Hufflepuff", "Ravenclaw", "Slytherin"])
-
-        if isinstance(custom_houses_list, list) and len(custom_houses_list) > 0:
-            if len(custom_houses_list) > 1:
-                houses_string = ", ".join(custom_houses_list[:-1]) + ", or " + custom_houses_list[-1]
-            else:
-                houses_string = custom_houses_list[0]
-        else:
-            houses_string = "a default house (if none are configured)"
-            print("WARNING: custom_houses in settings is not a valid list or is empty.")
-
-        prompt_parts = [
-            f"You are an AI Sorting Hat for the {academy_name}. You are very old and very smart.",
-            "Your job is to talk to a Grade 6 student who is learning English. Use VERY simple words and short sentences. Be friendly and easy to understand.",
-            "Speak DIRECTLY to the student as the Sorting Hat. Do NOT say things like 'Here is my response:'. Just start talking.",
-            f"For this talk, your main personality is: {self.hat_tone}."
-        ]
-
-        if self.conversation_step < self.questions_for_this_round:
-            question_number = self.conversation_step + 1
-            if self.conversation_step == 0:
-                prompt_parts.append(f"This is your first time talking. Ask the student your Question {question_number} to learn about them. For example: 'Hello! What is your name?' or 'Tell me, what do you like to do for fun?'. Keep your question short and simple. Do NOT sort the student yet.")
-            else:
-                prompt_parts.append(f"The student answered your last question. Now, ask your Question {question_number}. It should be a new, simple question to learn more about them. For example: 'What makes you feel brave?' or 'What is your favorite subject in school?'. Do NOT sort the student yet.")
-
-        elif self.conversation_step == self.questions_for_this_round:
-            max_students = self.get_setting("max_students_in_class", 20)
-            num_houses = len(custom_houses_list) if custom_houses_list and isinstance(custom_houses_list, list) and len(custom_houses_list) > 0 else 4
-            group_balance_info = ""
-            if num_houses > 0:
-                try:
-                    max_students = int(max_students)
-                    base_size = max_students // num_houses
-                    remainder = max_students % num_houses
-                    group_sizes = {}
-                    for i in range(num_houses):
-                        size = base_size + 1 if i < remainder else base_size
-                        if size in group_sizes:
-                            group_sizes[size] += 1
-                        else:
-                            group_sizes[size] = 1
-                    size_descriptions = []
-                    for size, count in sorted(group_sizes.items(), reverse=True):
-                        group_str = "group" if count == 1 else "groups"
-                        student_str = "student" if size == 1 else "students"
-                        size_descriptions.append(f"{count} {group_str} with {size} {student_str}")
-                    group_balance_info = (f"The maximum class size is {max_students}. To keep the houses balanced, "
-                                          f"they should be organized as evenly as possible: {', and '.join(size_descriptions)}. "
-                                          "Keep this principle of balance in mind when you are sorting.")
-                except (ValueError, TypeError):
-                    group_balance_info = "Your goal is to keep the houses balanced."
-                    print(f"WARNING: max_students_in_class ('{max_students}') is not a valid number. Using default balance prompt.")
-
-            prompt_parts.append(f"You have asked all your questions. This is your final answer. Based on what the student said, you MUST choose one of these {house_system_name} for them: {houses_string}. {group_balance_info} Tell them the house and give a short, simple reason why you chose it. You MUST sort them now.")
-
-        else:
-             prompt_parts.append(f"Something is wrong. Just sort the student into one of the {house_system_name}: {houses_string}. Give a simple reason.")
-
-        word_target_q = self.get_setting("response_formatting.target_word_count_question", 25)
-        word_target_sort = self.get_setting("response_formatting.target_word_count", 70)
-
-        is_question_turn = (self.conversation_step < self.questions_for_this_round)
-        if is_question_turn:
-             prompt_parts.append(f"Your question should be about {word_target_q} words long.")
-        else:
-             prompt_parts.append(f"Your full answer should be about {word_target_sort} words long.")
-
-        prompt_parts.append(f"Only use the house names I gave you: {houses_string}. Do not use stars (*) or long dashes (—) in your answer.")
-        return " ".join(prompt_parts)
+        try:
+            return _build_system_prompt(self.settings, self.hat_tone, self.conversation_step, self.questions_for_this_round)
+        except TypeError: # A setting value from a hand-edited file that cannot be hashed; build without caching
+            return _build_system_prompt.__wrapped__(self.settings, self.hat_tone, self.conversation_step, self.questions_for_this_round)
 
     def construct_user_message(self):
         if self.conversation_step == 0 and self.user_text is None:
@@ -330,22 +666,22 @@ class DeepSeekWorker(QThread):
             self.status_signal.emit("API Error: URL not configured.")
             return
 
-        self.status_signal.emit(f"The {self.get_setting('academy_name', 'SortingHat')} is thinking...")
+        self.status_signal.emit(f"The {self.settings.academy_name} is thinking...")
         system_prompt = self.get_system_prompt()
         user_message_content = self.construct_user_message()
 
-        print(f"DEBUG DeepSeekWorker: Step: {self.conversation_step}, Total Q's: {self.questions_for_this_round}, User Text: '{self.user_text}'")
-        print(f"DEBUG DeepSeekWorker: System Prompt:\n{system_prompt}\n---")
-        print(f"DEBUG DeepSeekWorker: User Message to API: {user_message_content}")
+        log.debug("DeepSeekWorker: Step: %s, Total Q's: %s, User Text: '%s'", self.conversation_step, self.questions_for_this_round, self.user_text)
+        log.debug("DeepSeekWorker: System Prompt:\n%s\n---", system_prompt)
+        log.debug("DeepSeekWorker: User Message to API: %s", user_message_content)
 
         headers = {"Authorization": f"Bearer {DEEPSEEK_API_KEY}", "Content-Type": "application/json"}
-        api_temp = float(self.get_setting("api_parameters.deepseek_temperature", 0.7))
-        max_tokens_override = int(self.get_setting("api_parameters.max_tokens_override", 0))
+        api_temp = float(self.settings.deepseek_temperature)
+        max_tokens_override = int(self.settings.max_tokens_override)
         is_question_turn = (self.conversation_step < self.questions_for_this_round)
         max_tokens = 80 if is_question_turn else 200
         if max_tokens_override > 0: max_tokens = max_tokens_override
 
-        print(f"DEBUG DeepSeek API: max_tokens: {max_tokens}, temperature: {api_temp}")
+        log.debug("DeepSeek API: max_tokens: %s, temperature: %s", max_tokens, api_temp)
         payload = {
             "model": "deepseek-chat",
             "messages": [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_message_content}],
@@ -353,22 +689,32 @@ class DeepSeekWorker(QThread):
             "temperature": api_temp,
         }
         try:
-            response = requests.post(DEEPSEEK_API_URL, headers=headers, json=payload, timeout=60)
-            response.raise_for_status()
-            response_data = response.json()
+            if self.stream:
+                message_content = self._stream_completion(headers, payload).strip()
+                if message_content:
+                    self.finished_signal.emit(message_content)
+                else:
+                    self.error_signal.emit("DeepSeek API: Empty message content in streamed response.")
+                return
+            with self._api_post(DEEPSEEK_API_URL, headers=headers, data=_json_dumps(payload)) as response:
+                response.raise_for_status()
+                response_data = _json_loads(response.content)
 
             if "choices" in response_data and len(response_data["choices"]) > 0:
                 message_content = response_data["choices"][0].get("message", {}).get("content")
                 if message_content:
-                    print(f"DEBUG DeepSeekWorker: API Response Content: {message_content[:200]}...")
-                    self.finished_signal.emit(message_content.strip())
+                    log.debug("DeepSeekWorker: API Response Content: %s...", message_content[:200])
+                    message_content = message_content.strip()
+                    self.finished_signal.emit(message_content)
                 else:
                     self.error_signal.emit("DeepSeek API: Empty message content in response.")
-                    print(f"ERROR DeepSeekWorker: Empty message content. Full response: {response_data}")
+                    log.error("DeepSeekWorker: Empty message content. Full response: %s", response_data)
             else:
                 err_detail = response_data.get('error', response_data)
                 self.error_signal.emit(f"DeepSeek API Error: Malformed response or error structure: {err_detail}")
-                print(f"ERROR DeepSeekWorker: Malformed response. Full response: {response_data}")
+                log.error("DeepSeekWorker: Malformed response. Full response: %s", response_data)
+        except WorkerCancelled:
+            log.debug("DeepSeekWorker: Cancelled.")
         except requests.exceptions.Timeout:
             self.error_signal.emit("DeepSeek API request timed out.")
             self.status_signal.emit("API Error: Timeout.")
@@ -383,7 +729,27 @@ class DeepSeekWorker(QThread):
             self.error_signal.emit(f"Error processing DeepSeek response: {e}")
             self.status_signal.emit(f"API Error: Processing error.")
         finally:
-            print("DEBUG DeepSeekWorker: run() method finished.")
+            log.debug("DeepSeekWorker: run() method finished.")
+
+    def _stream_completion(self, headers, payload):
+        """Requests the reply as server-sent events, emitting each content delta as it arrives."""
+        pieces = []
+        with self._api_post(DEEPSEEK_API_URL, headers=headers, data=_json_dumps({**payload, "stream": True})) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(): # Raw bytes: the JSON parser takes UTF-8 directly
+                if not line or not line.startswith(b"data:"):
+                    continue # Blank separators and SSE keep-alive comments
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                choices = _json_loads(data).get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    pieces.append(delta)
+                    self.partial_text_signal.emit(delta)
+        message_content = "".join(pieces)
+        log.debug("DeepSeekWorker: Streamed Response Content: %s...", message_content[:200])
+        return message_content
 
 
 # -----------------------------------------------------------------------------
@@ -391,36 +757,68 @@ class DeepSeekWorker(QThread):
 # This worker uses pyttsx3, which relies on offline system voices.
 # It does not make any network calls and works in China.
 # -----------------------------------------------------------------------------
-class TextToSpeechWorker(QThread):
+# One engine for the whole session: pyttsx3.init() brings up SAPI/NSSpeech each time, and
+# re-initialising is a known source of crashes. Only used from the single "tts" pool thread.
+_TTS_ENGINE = None
+_TTS_LOCK = threading.Lock()
+# The engine's voice list never changes while it lives, and on SAPI enumerating it
+# re-reads the registry, so it is fetched once along with an id -> voice index.
+_VOICES = None
+_VOICE_BY_ID = {}
+# The worker currently speaking through _TTS_ENGINE; only it may stop the engine, so a stale
+# worker's stop request cannot cut off the next worker's speech. Guarded by _TTS_LOCK.
+_TTS_OWNER = None
+
+def _get_tts_engine():
+    global _TTS_ENGINE, _VOICES, _VOICE_BY_ID
+    with _TTS_LOCK:
+        if _TTS_ENGINE is None:
+            engine = pyttsx3.init()
+            if engine:
+                _VOICES = list(engine.getProperty('voices') or [])
+                _VOICE_BY_ID = {v.id: v for v in _VOICES}
+            _TTS_ENGINE = engine
+        return _TTS_ENGINE
+
+TTS_ITERATE_INTERVAL_S = 0.02 # How often the speech loop pumps the engine and checks for a stop request
+
+_TTS_TRANSLATE = str.maketrans({"—": ", ", "*": None}) # Long dashes read as a pause; stars are dropped
+_TTS_STRIP_RE = re.compile(r'[^\w\s\'\.,?!:"“”‘’()-]') # Anything the engine would spell out or choke on
+_TTS_WHITESPACE_RE = re.compile(r'\s+')
+
+class TextToSpeechWorker(PooledWorker):
     finished_signal = Signal()
     error_signal = Signal(str)
     status_signal = Signal(str)
+    POOL = "tts" # Runs one at a time, on the thread that owns the shared engine
 
     def __init__(self, text_to_speak, tts_settings):
+        """text_to_speak=None starts the worker in streaming mode: text arrives through
+        enqueue_text() and the worker finishes after end_of_text()."""
         super().__init__()
         self.raw_text_to_speak = text_to_speak
-        self.tts_settings = tts_settings if isinstance(tts_settings, dict) else \
-                            DEFAULT_SETTINGS_TEMPLATE["tts_settings"].copy()
+        self._text_queue = queue.Queue() if text_to_speak is None else None
+        self.tts_settings = tts_settings if isinstance(tts_settings, Mapping) else \
+                            default_settings()["tts_settings"]
         self.engine = None
         self._should_stop = False
         self._engine_initialized_successfully = False
-        print("DEBUG TTS Worker: Initialized.")
+        log.debug("TTS Worker: Initialized.")
 
     def _filter_text_for_tts(self, text):
         if not isinstance(text, str): text = str(text)
-        print(f"TTS_FILTER: Original In: '{text}'")
-        filtered_text = text.replace("—", ", ")
-        filtered_text = filtered_text.replace("*", "")
-        filtered_text = re.sub(r'[^\w\s\'\.,?!:"“”‘’()-]', '', filtered_text)
-        filtered_text = re.sub(r'\s+', ' ', filtered_text).strip()
-        print(f"TTS_FILTER: Filtered Out: '{filtered_text}'")
+        log.debug("TTS_FILTER: Original In: '%s'", text)
+        filtered_text = text.translate(_TTS_TRANSLATE)
+        filtered_text = _TTS_STRIP_RE.sub('', filtered_text)
+        filtered_text = _TTS_WHITESPACE_RE.sub(' ', filtered_text).strip()
+        log.debug("TTS_FILTER: Filtered Out: '%s'", filtered_text)
         return filtered_text
 
     def _initialize_engine(self):
         if self.engine is not None: return True
 
         try:
-            self.engine = pyttsx3.init()
+            self.engine = _get_tts_engine()
             if not self.engine:
                 self.error_signal.emit("Failed to initialize Text-to-Speech engine (pyttsx3.init() returned None).")
                 self.status_signal.emit("TTS Error: Engine init failed.")
@@ -428,9 +826,9 @@ class TextToSpeechWorker(QThread):
 
             self._engine_initialized_successfully = True
 
-            engine_voices = self.engine.getProperty('voices')
+            engine_voices = _VOICES or []
             selected_voice_index = int(self.tts_settings.get("selected_voice_index", 0))
-            target_tts_rate = int(self.tts_settings.get("tts_rate", DEFAULT_SETTINGS_TEMPLATE["tts_settings"]["tts_rate"]))
+            target_tts_rate = int(self.tts_settings.get("tts_rate", default_settings()["tts_settings"]["tts_rate"]))
 
             voice_id_to_use = None
             available_voices_from_settings = self.tts_settings.get("available_voices", [])
@@ -440,63 +838,99 @@ class TextToSpeechWorker(QThread):
                 voice_id_to_use = available_voices_from_settings[selected_voice_index].get("id")
 
             if voice_id_to_use:
-                found_by_id = any(v.id == voice_id_to_use for v in engine_voices)
-                if found_by_id:
+                if voice_id_to_use in _VOICE_BY_ID:
                     self.engine.setProperty('voice', voice_id_to_use)
-                    print(f"INFO: TTS: Using voice (ID from settings): {available_voices_from_settings[selected_voice_index].get('name', voice_id_to_use)}")
+                    log.info("TTS: Using voice (ID from settings): %s", available_voices_from_settings[selected_voice_index].get('name', voice_id_to_use))
                 else:
-                    print(f"WARNING: TTS: Voice ID '{voice_id_to_use}' from settings not found. Falling back.")
+                    log.warning("TTS: Voice ID '%s' from settings not found. Falling back.", voice_id_to_use)
                     voice_id_to_use = None
 
             if not voice_id_to_use and engine_voices:
                 actual_index = selected_voice_index if 0 <= selected_voice_index < len(engine_voices) else 0
                 if not (0 <= selected_voice_index < len(engine_voices)):
-                     print(f"WARNING: TTS: Voice index {selected_voice_index} invalid for current {len(engine_voices)} voices. Using index {actual_index}.")
+                     log.warning("TTS: Voice index %s invalid for current %s voices. Using index %s.", selected_voice_index, len(engine_voices), actual_index)
                 chosen_voice = engine_voices[actual_index]
                 self.engine.setProperty('voice', chosen_voice.id)
-                print(f"INFO: TTS: Using voice (engine index {actual_index}): {chosen_voice.name}")
+                log.info("TTS: Using voice (engine index %s): %s", actual_index, chosen_voice.name)
             elif not engine_voices:
                 self.status_signal.emit("Warning: No TTS voices found by engine. Using system default.")
-                print("WARNING: TTS: No voices found by pyttsx3. Using system default.")
+                log.warning("TTS: No voices found by pyttsx3. Using system default.")
 
-            print(f"INFO: TTS: Setting rate to: {target_tts_rate} wpm")
+            log.info("TTS: Setting rate to: %s wpm", target_tts_rate)
             self.engine.setProperty('rate', target_tts_rate)
             self.engine.setProperty('volume', 0.9)
             return True
 
         except Exception as e:
             err_msg = f"TTS engine initialization error: {e}"
-            print(f"ERROR TTS Worker: {err_msg}")
+            log.error("TTS Worker: %s", err_msg)
             self.error_signal.emit(err_msg)
             self.status_signal.emit(f"TTS Error: {e}")
             self.engine = None
             self._engine_initialized_successfully = False
             return False
 
+    def enqueue_text(self, text):
+        """Streaming mode: queues complete sentences to be spoken as soon as the engine is free."""
+        self._text_queue.put(text)
+
+    def end_of_text(self):
+        """Streaming mode: no more text will follow; the worker finishes once the queue is spoken."""
+        self._text_queue.put(None)
+
+    def _speak(self, text):
+        if self._should_stop:
+             log.debug("TTS Worker: Stop signal received before engine.say(), skipping speech.")
+             return
+        self.engine.say(text)
+        log.debug("TTS Worker: Starting external speech loop.")
+        # Drive the engine ourselves instead of runAndWait(), so a stop request is seen within
+        # one tick rather than when the driver next reaches a sentence boundary
+        self.engine.startLoop(False)
+        try:
+            self.engine.iterate()
+            while self.engine.isBusy() and not self._should_stop:
+                time.sleep(TTS_ITERATE_INTERVAL_S)
+                self.engine.iterate()
+            if self._should_stop:
+                self.engine.stop()
+        finally:
+            self.engine.endLoop()
+        log.debug("TTS Worker: Speech loop finished.")
+
     def run(self):
         self.status_signal.emit("The Sorting Hat is preparing to speak...")
-        self.text_to_speak = self._filter_text_for_tts(self.raw_text_to_speak)
+        if self._text_queue is None:
+            self.text_to_speak = self._filter_text_for_tts(self.raw_text_to_speak)
 
-        if not self.text_to_speak:
-            self.error_signal.emit("Text to speak is empty after filtering.")
-            self.status_signal.emit("TTS Error: No speakable text.")
-            self.finished_signal.emit()
-            return
+            if not self.text_to_speak:
+                self.error_signal.emit("Text to speak is empty after filtering.")
+                self.status_signal.emit("TTS Error: No speakable text.")
+                self.finished_signal.emit()
+                return
 
-        print(f"DEBUG TTS Worker: run() started. Text: '{self.text_to_speak[:100]}...'")
+            log.debug("TTS Worker: run() started. Text: '%s...'", self.text_to_speak[:100])
+        else:
+            log.debug("TTS Worker: run() started in streaming mode.")
 
         if not self._initialize_engine():
             self.finished_signal.emit()
             return
 
+        global _TTS_OWNER
+        with _TTS_LOCK:
+            _TTS_OWNER = self
         try:
-            if self._should_stop:
-                 print("DEBUG TTS Worker: Stop signal received before engine.say(), skipping speech.")
+            if self._text_queue is None:
+                self._speak(self.text_to_speak)
             else:
-                self.engine.say(self.text_to_speak)
-                print("DEBUG TTS Worker: Before engine.runAndWait().")
-                self.engine.runAndWait()
-                print("DEBUG TTS Worker: After engine.runAndWait().")
+                while not self._should_stop:
+                    text = self._text_queue.get()
+                    if text is None:
+                        break
+                    text = self._filter_text_for_tts(text)
+                    if text:
+                        self._speak(text)
 
             if not self._should_stop:
                 self.status_signal.emit("The Sorting Hat has spoken.")
@@ -505,26 +939,35 @@ class TextToSpeechWorker(QThread):
 
         except RuntimeError as e:
             err_msg = f"Text-to-Speech (TTS) RuntimeError: {e}"
-            print(f"ERROR TTS Worker: {err_msg}")
+            log.error("TTS Worker: %s", err_msg)
             self.error_signal.emit(err_msg)
             self.status_signal.emit(f"TTS Error: {e}")
         except Exception as e:
             err_msg = f"Unexpected Text-to-Speech (TTS) error: {e}"
-            print(f"ERROR TTS Worker: {err_msg}")
+            log.error("TTS Worker: %s", err_msg)
             self.error_signal.emit(err_msg)
             self.status_signal.emit(f"TTS Error: {e}")
         finally:
-            print("DEBUG TTS Worker: run() method finished. Emitting finished_signal.")
+            with _TTS_LOCK:
+                if _TTS_OWNER is self:
+                    _TTS_OWNER = None
+            log.debug("TTS Worker: run() method finished. Emitting finished_signal.")
             self.finished_signal.emit()
 
     def stop_tts_signal(self):
-        print("DEBUG TTS Worker: stop_tts_signal() called.")
+        log.debug("TTS Worker: stop_tts_signal() called.")
         self._should_stop = True
+        if self._text_queue is not None:
+            self._text_queue.put(None) # Wake a streaming run() waiting for more text
         if hasattr(self, 'engine') and self.engine is not None and self._engine_initialized_successfully:
-            try:
-                print("DEBUG TTS Worker: Attempting engine.stop() due to stop_tts_signal.")
-                self.engine.stop()
-            except Exception as e:
-                print(f"DEBUG TTS Worker: Exception during engine.stop() in stop_tts_signal: {e}")
+            with _TTS_LOCK: # Held across stop() so the engine cannot change hands in between
+                if _TTS_OWNER is not self:
+                    log.debug("TTS Worker: Engine is not speaking for this worker; leaving it running.")
+                    return
+                try:
+                    log.debug("TTS Worker: Attempting engine.stop() due to stop_tts_signal.")
+                    self.engine.stop()
+                except Exception as e:
+                    log.debug("TTS Worker: Exception during engine.stop() in stop_tts_signal: %s", e)
         else:
-            print("DEBUG TTS Worker: Engine not available or not initialized for stop_tts_signal.")
\ No newline at end of file
+            log.debug("TTS Worker: Engine not available or not initialized for stop_tts_signal.")
\ No newline at end of file